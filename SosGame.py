@@ -1,80 +1,211 @@
 from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Sequence
+import itertools
 import random
 import json
-import urllib.request
-import urllib.error
 import time
+from sos_llm import ClaudeMoveClient
+from sos_symmetry import symmetry_zobrist
+from sosUtilities import EMPTY, S_CODE, O_CODE, move_outlook, sos_lines_at, sos_triplets
 
 CLAUDE_API_KEY = "key" 
 
+# Cell codes used by the flat board (0 = empty)
+PIECE_CODES = {'': EMPTY, 'S': S_CODE, 'O': O_CODE}
+CODE_PIECES = ('', 'S', 'O')
+
+# Every game gets the next id so per-game stats can tell games apart; look-ahead copies get None
+_game_ids = itertools.count(1)
+
+
+# Read-only board[r][c] view over a game's flat cell array
+class BoardView(Sequence):
+    __slots__ = ('_cells', '_n')
+
+    def __init__(self, cells, n):
+        self._cells = cells
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, r):
+        if isinstance(r, slice):
+            return [self[i] for i in range(*r.indices(self._n))]
+        if r < 0:
+            r += self._n
+        if not 0 <= r < self._n:
+            raise IndexError("board row out of range")
+        return RowView(self._cells, r * self._n, self._n)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(row == other_row for row, other_row in zip(self, other))
+
+
+class RowView(Sequence):
+    __slots__ = ('_cells', '_start', '_n')
+
+    def __init__(self, cells, start, n):
+        self._cells = cells
+        self._start = start
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, c):
+        if isinstance(c, slice):
+            return [self[i] for i in range(*c.indices(self._n))]
+        if c < 0:
+            c += self._n
+        if not 0 <= c < self._n:
+            raise IndexError("board column out of range")
+        return CODE_PIECES[self._cells[self._start + c]]
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+
+# (row, col, piece) view over a packed history: each entry is cell_index << 1 | (code - 1)
+class HistoryView(Sequence):
+    __slots__ = ('_packed', '_n')
+
+    def __init__(self, packed, n):
+        self._packed = packed
+        self._n = n
+
+    def __len__(self):
+        return len(self._packed)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self._packed)))]
+        value = self._packed[i]
+        r, c = divmod(value >> 1, self._n)
+        return r, c, CODE_PIECES[(value & 1) + 1]
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+
 
 class PlayerBase(ABC):
+    __slots__ = ('name', 'piece_choice')
+
     def __init__(self, name, piece_choice):
         self.name = name
         self.piece_choice = piece_choice
 
+    # cancel: optional threading.Event; once it is set the caller no longer wants
+    # the answer, and players that think for a while give up early
     @abstractmethod
-    def get_move(self, game):
+    def get_move(self, game, cancel=None):
         pass
 
 class HumanPlayer(PlayerBase):
-    def get_move(self, game):
+    __slots__ = ()
+
+    def get_move(self, game, cancel=None):
         return None, None, None
 
 class ComputerPlayer(PlayerBase):
-    def __init__(self, name, piece_choice):
+    __slots__ = ('model', 'system_prompt', 'strategy', 'think_delay', 'verbose', 'client', 'move_cache', 'book')
+
+    # strategy: "random" (score if possible, else random) or "heuristic" (one-pass scoring)
+    # think_delay: pause before fallback moves, only wanted when a human is watching
+    # verbose: print what the AI is doing (off for headless batch runs)
+    # move_cache: optional sos_llm.LLMMoveCache consulted before paying for a Claude call
+    # book: optional sos_book.OpeningBook; a hit is played straight away
+    def __init__(self, name, piece_choice, strategy="random", think_delay=0.0, verbose=True, move_cache=None, book=None):
         super().__init__(name, piece_choice)
         self.model = "claude-3-haiku-20240307" 
         self.system_prompt = (
             "You are an expert SOS game player. "
             "Output move as JSON: {\"row\": <int>, \"col\": <int>, \"piece\": \"<S or O>\"}."
         )
+        self.strategy = strategy
+        self.think_delay = think_delay
+        self.verbose = verbose
+        self.client = None
+        self.move_cache = move_cache
+        self.book = book
 
-    def get_move(self, game):
-        empty_cells = []
-        for r in range(game.board_size):
-            for c in range(game.board_size):
-                if game.board[r][c] == '':
-                    empty_cells.append((r, c))
+    def _say(self, message):
+        if self.verbose:
+            print(message)
 
-        if not empty_cells:
+    def get_move(self, game, cancel=None):
+        if game.is_board_full():
             return None, None, None
 
-        print(f"AI ({self.name}) is thinking...")
+        self._say(f"AI ({self.name}) is thinking...")
+
+        # 0. Solved positions need no thought at all
+        if self.book is not None:
+            hit = self.book.lookup(game)
+            if hit is not None:
+                self._say(f"AI (Book) played: {hit[0]}, {hit[1]}, {hit[2]}")
+                return hit[:3]
 
         # 1. Attempt Claude Move
         if "sk-ant" in CLAUDE_API_KEY:
             try:
-                move = self._get_llm_move_direct(game, empty_cells)
+                move = self._get_llm_move_direct(game, list(game.legal_moves()), cancel)
                 if move:
                     return move
             except Exception as e:
-                print(f"  > Claude Error: {e}. Switching to fallback strategy.")
+                self._say(f"  > Claude Error: {e}. Switching to fallback strategy.")
         else:
-            print("  > API Key missing. Switching to fallback strategy.")
+            self._say("  > API Key missing. Switching to fallback strategy.")
 
         # 2. Fallback Strategy (Ensures video never fails)
-        time.sleep(0.5) 
+        if self.think_delay:
+            if cancel is None:
+                time.sleep(self.think_delay)
+            else:
+                cancel.wait(self.think_delay)
+        if cancel is not None and cancel.is_set():
+            return None, None, None
+
+        if self.strategy == "heuristic":
+            return self.heuristic_move(game)
         
         # Try to win immediately
-        for r, c in empty_cells:
-            for piece in ['S', 'O']:
-                temp_board = [row[:] for row in game.board]
-                temp_board[r][c] = piece
-                soses = self._check_for_sos_temp(r, c, piece, temp_board, game.board_size)
-                if soses:
-                    print(f"AI (Fallback) chose winning move: {r}, {c}, {piece}")
-                    return r, c, piece
+        for r, c, piece, _ in game.scoring_moves():
+            self._say(f"AI (Fallback) chose winning move: {r}, {c}, {piece}")
+            return r, c, piece
 
         # Random move
-        r, c = random.choice(empty_cells)
+        r, c = game.random_free_cell()
         return r, c, self.piece_choice
 
-    def _get_llm_move_direct(self, game, empty_cells):
+    # Rates every (cell, piece) in one pass: most points first, then fewest setups for the opponent
+    def heuristic_move(self, game):
+        best_key = None
+        best = []
+        for r, c, piece, points, setups in game.rate_moves():
+            key = (points, -setups)
+            if best_key is None or key > best_key:
+                best_key = key
+                best = [(r, c, piece)]
+            elif key == best_key:
+                best.append((r, c, piece))
+        return random.choice(best)
+
+    def _get_llm_move_direct(self, game, empty_cells, cancel=None):
         # 1. Prepare Board String
         board_str = ""
-        for r in range(game.board_size):
-            row_str = " | ".join([c if c else " " for c in game.board[r]])
+        n = game.board_size
+        symbols = (" ", "S", "O")
+        for r in range(n):
+            row_str = " | ".join([symbols[code] for code in game._cells[r * n:(r + 1) * n]])
             board_str += f"Row {r}: [{row_str}]\n"
 
         # 2. Construct Prompt
@@ -86,75 +217,104 @@ class ComputerPlayer(PlayerBase):
             "Respond ONLY with valid JSON."
         )
 
-        # 3. Call Anthropic API (Direct HTTP Request)
-        url = "https://api.anthropic.com/v1/messages"
-        
-        payload = {
-            "model": self.model,
-            "max_tokens": 1024,
-            "system": self.system_prompt,
-            "messages": [
-                {"role": "user", "content": user_message}
-            ]
-        }
-
-        req = urllib.request.Request(
-            url, 
-            data=json.dumps(payload).encode('utf-8'),
-            headers={
-                'content-type': 'application/json',
-                'x-api-key': CLAUDE_API_KEY,
-                'anthropic-version': '2023-06-01'
-            }
-        )
+        # 3. Reuse an earlier answer for this position (up to symmetry)
+        mode = type(game).__name__
+        if self.move_cache is not None:
+            cached = self.move_cache.get(game._cells, game.board_size, self.name, mode)
+            if cached is not None:
+                self._say(f"AI (Claude, cached) decided: {cached[0]}, {cached[1]}, {cached[2]}")
+                return cached
 
-        with urllib.request.urlopen(req) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            content = result['content'][0]['text']
-            
-            # Extract JSON from potential text wrapper
-            start = content.find('{')
-            end = content.rfind('}') + 1
-            if start != -1 and end != -1:
-                json_str = content[start:end]
-                data = json.loads(json_str)
-                
-                r, c = int(data["row"]), int(data["col"])
-                piece = str(data["piece"]).upper()
-
-                if (r, c) in empty_cells and piece in ['S', 'O']:
-                    print(f"AI (Claude) decided: {r}, {c}, {piece}")
-                    return r, c, piece
+        # 4. Call Anthropic API over the player's pooled client
+        if self.client is None:
+            self.client = ClaudeMoveClient(CLAUDE_API_KEY, self.model, self.system_prompt)
+        content = self.client.complete(user_message, cancel)
+
+        # Extract JSON from potential text wrapper
+        start = content.find('{')
+        end = content.rfind('}') + 1
+        if start != -1 and end != -1:
+            json_str = content[start:end]
+            data = json.loads(json_str)
             
-        return None
+            r, c = int(data["row"]), int(data["col"])
+            piece = str(data["piece"]).upper()
 
-    def _check_for_sos_temp(self, r, c, piece, board, board_size):
-        found = []
-        dirs = [(0, 1), (1, 0), (1, 1), (1, -1)]
-        def valid(rv, cv): return 0 <= rv < board_size and 0 <= cv < board_size
-
-        if piece == 'O':
-            for dr, dc in dirs:
-                if valid(r-dr, c-dc) and board[r-dr][c-dc]=='S' and valid(r+dr, c+dc) and board[r+dr][c+dc]=='S':
-                    found.append(1)
-        elif piece == 'S':
-            for dr, dc in dirs:
-                if valid(r+2*dr, c+2*dc) and board[r+2*dr][c+2*dc]=='S' and valid(r+dr, c+dc) and board[r+dr][c+dc]=='O':
-                    found.append(1)
-                if valid(r-2*dr, c-2*dc) and board[r-2*dr][c-2*dc]=='S' and valid(r-dr, c-dc) and board[r-dr][c-dc]=='O':
-                    found.append(1)
-        return found
+            if (r, c) in empty_cells and piece in ['S', 'O']:
+                self._say(f"AI (Claude) decided: {r}, {c}, {piece}")
+                if self.move_cache is not None:
+                    self.move_cache.put(game._cells, game.board_size, self.name, mode, (r, c, piece))
+                return r, c, piece
+        
+        return None
 
 class SOSGameBase(ABC):
-    def __init__(self, board_size, blue_player, red_player):
+    __slots__ = ('game_id', 'board_size', 'compact', '_cells', '_free_cells', '_free_pos', '_history',
+                 '_threats', '_sym_hashes', 'current_turn_is_blue', 'game_over', 'winner', 'blue_player', 'red_player')
+
+    # The flat cell array is the only board; `board` is always a read-only view of it.
+    # compact=True also packs the history into integers (history becomes a read-only view).
+    # track_threats=True keeps a live map of scoring and setup cells (see scoring_moves)
+    def __init__(self, board_size, blue_player, red_player, compact=False, track_threats=False):
+        self.game_id = next(_game_ids)
         self.board_size = board_size
-        self.board = [['' for _ in range(board_size)] for _ in range(board_size)]
+        self.compact = compact
+        self._threats = ({}, {}, {}, {}) if track_threats else None
+        self.board = [[''] * board_size] * board_size
         self.current_turn_is_blue = True
         self.game_over = False
         self.winner = None
         self.blue_player = blue_player
         self.red_player = red_player
-        self.history = []
+        self._history = array('q') if compact else []
+
+    # Assigning a whole board (tests, replays) rebuilds the cells and free-cell index
+    @property
+    def board(self):
+        return BoardView(self._cells, self.board_size)
+
+    @board.setter
+    def board(self, rows):
+        n = self.board_size
+        self._cells = bytearray(PIECE_CODES[rows[r][c]] for r in range(n) for c in range(n))
+        # 2-byte indexes while every cell index fits; positions of taken cells are never read
+        typecode = 'H' if n * n < 65536 else 'I'
+        self._free_cells = array(typecode, (idx for idx in range(n * n) if not self._cells[idx]))
+        self._free_pos = array(typecode, bytes(self._free_cells.itemsize * n * n))
+        for i, idx in enumerate(self._free_cells):
+            self._free_pos[idx] = i
+        self._sym_hashes = None
+        if self._threats is not None:
+            for table in self._threats:
+                table.clear()
+            for idx in self._free_cells:
+                self._update_threats(idx)
+
+    @property
+    def history(self):
+        if self.compact:
+            return HistoryView(self._history, self.board_size)
+        return self._history
+
+    # Cheap independent copy for AI look-ahead (players are shared, not copied). The
+    # copy has no game_id, so searching on it doesn't count towards the real game's stats.
+    def copy(self):
+        other = object.__new__(type(self))
+        other.game_id = None
+        other.board_size = self.board_size
+        other.compact = self.compact
+        other._cells = self._cells[:]
+        other._free_cells = self._free_cells[:]
+        other._free_pos = self._free_pos[:]
+        other._history = self._history[:]
+        other._threats = None if self._threats is None else tuple(table.copy() for table in self._threats)
+        other._sym_hashes = None if self._sym_hashes is None else self._sym_hashes[:]
+        other.current_turn_is_blue = self.current_turn_is_blue
+        other.game_over = self.game_over
+        other.winner = self.winner
+        other.blue_player = self.blue_player
+        other.red_player = self.red_player
+        return other
 
     def get_current_player(self):
         return self.blue_player if self.current_turn_is_blue else self.red_player
@@ -162,33 +322,180 @@ class SOSGameBase(ABC):
     def _is_valid(self, r, c):
         return 0 <= r < self.board_size and 0 <= c < self.board_size
 
+    def is_free(self, r, c):
+        return self._is_valid(r, c) and not self._cells[r * self.board_size + c]
+
+    # The piece on (r, c), '' when empty; board[r][c] without building a row view
+    def cell(self, r, c):
+        return CODE_PIECES[self._cells[r * self.board_size + c]]
+
+    def free_count(self):
+        return len(self._free_cells)
+
+    # Yields every empty (row, col); don't make moves while iterating
+    def legal_moves(self):
+        n = self.board_size
+        for idx in self._free_cells:
+            yield divmod(idx, n)
+
+    def random_free_cell(self, rng=random):
+        if not self._free_cells:
+            return None
+        return divmod(rng.choice(self._free_cells), self.board_size)
+
     def is_board_full(self):
-        return all(self.board[r][c] != '' for r in range(self.board_size) for c in range(self.board_size))
+        return not self._free_cells
+
+    # Puts a piece down and keeps the free-cell index in sync (swap-remove, O(1))
+    def _place(self, r, c, piece):
+        idx = r * self.board_size + c
+        code = PIECE_CODES[piece]
+        self._cells[idx] = code
+        pos = self._free_pos[idx]
+        last = self._free_cells.pop()
+        if last != idx:
+            self._free_cells[pos] = last
+            self._free_pos[last] = pos
+        if self.compact:
+            self._history.append(idx << 1 | (code - 1))
+        else:
+            self._history.append((r, c, piece))
+        if self._sym_hashes is not None:
+            self._toggle_hashes(idx, code)
+        if self._threats is not None:
+            for table in self._threats:
+                table.pop(idx, None)
+            for j in self._line_neighbours(idx):
+                if not self._cells[j]:
+                    self._update_threats(j)
+
+    # Starts keeping the threat map on a game created without it
+    def enable_threat_map(self):
+        if self._threats is None:
+            self._threats = ({}, {}, {}, {})
+            for idx in self._free_cells:
+                self._update_threats(idx)
+
+    def disable_threat_map(self):
+        self._threats = None
+
+    # Takes the last piece back off (r, c); the inverse of _place
+    def _unplace(self, r, c):
+        idx = r * self.board_size + c
+        if self._sym_hashes is not None:
+            self._toggle_hashes(idx, self._cells[idx])
+        self._cells[idx] = EMPTY
+        self._free_pos[idx] = len(self._free_cells)
+        self._free_cells.append(idx)
+        self._history.pop()
+        if self._threats is not None:
+            self._update_threats(idx)
+            for j in self._line_neighbours(idx):
+                if not self._cells[j]:
+                    self._update_threats(j)
+
+    # Zobrist hashes of the board under all 8 symmetries (see sos_symmetry.canonical_key).
+    # Built on first use, then kept current by _place/_unplace.
+    def symmetry_hashes(self):
+        if self._sym_hashes is None:
+            table = symmetry_zobrist(self.board_size)
+            hashes = [0] * 8
+            for idx, code in enumerate(self._cells):
+                if code:
+                    hashes = [h ^ k for h, k in zip(hashes, table[idx][code])]
+            self._sym_hashes = hashes
+        return self._sym_hashes
+
+    def position_hash(self):
+        return self.symmetry_hashes()[0]
+
+    def _toggle_hashes(self, idx, code):
+        keys = symmetry_zobrist(self.board_size)[idx][code]
+        self._sym_hashes = [h ^ k for h, k in zip(self._sym_hashes, keys)]
+
+    # Every other cell sharing a line of three with idx (at most 24)
+    def _line_neighbours(self, idx):
+        ends, middles = sos_triplets(self.board_size)
+        for mid, far in ends[idx]:
+            yield idx + mid
+            yield idx + far
+        for a, b in middles[idx]:
+            yield idx + a
+            yield idx + b
+
+    # Refreshes one empty cell's entries in the threat map
+    def _update_threats(self, idx):
+        for table, value in zip(self._threats, move_outlook(self._cells, self.board_size, idx)):
+            if value:
+                table[idx] = value
+            else:
+                table.pop(idx, None)
+
+    # (r, c, piece, points) for every move that completes an SOS right now
+    def scoring_moves(self):
+        n = self.board_size
+        if self._threats is not None:
+            s_points, o_points = self._threats[0], self._threats[1]
+            return ([(*divmod(idx, n), 'S', pts) for idx, pts in s_points.items()] +
+                    [(*divmod(idx, n), 'O', pts) for idx, pts in o_points.items()])
+        moves = []
+        for idx in self._free_cells:
+            s_pts, o_pts, _, _ = move_outlook(self._cells, n, idx)
+            if s_pts:
+                moves.append((*divmod(idx, n), 'S', s_pts))
+            if o_pts:
+                moves.append((*divmod(idx, n), 'O', o_pts))
+        return moves
 
+    def has_scoring_move(self):
+        if self._threats is not None:
+            return bool(self._threats[0] or self._threats[1])
+        return bool(self.scoring_moves())
+
+    # (r, c, piece, points, setups) for every legal move, rated in one pass
+    def rate_moves(self):
+        n = self.board_size
+        cells = self._cells
+        for idx in self._free_cells:
+            r, c = divmod(idx, n)
+            s_points, o_points, s_setups, o_setups = move_outlook(cells, n, idx)
+            yield r, c, 'S', s_points, s_setups
+            yield r, c, 'O', o_points, o_setups
+
+    # How many SOSes `piece` on (r, c) would complete
+    def move_points(self, r, c, piece):
+        if self._threats is not None:
+            return self._threats[0 if piece == 'S' else 1].get(r * self.board_size + c, 0)
+        return len(self._check_for_sos(r, c, piece))
+
+    # Cells where `piece` would leave the opponent an SOS to finish
+    def cells_to_avoid(self, piece):
+        n = self.board_size
+        if self._threats is not None:
+            return {divmod(idx, n) for idx in self._threats[2 if piece == 'S' else 3]}
+        slot = 2 if piece == 'S' else 3
+        return {divmod(idx, n) for idx in self._free_cells if move_outlook(self._cells, n, idx)[slot]}
+
+    # Lines that `piece` on (r, c) completes, from the shared per-size triplet table
     def _check_for_sos(self, r, c, piece):
-        found = []
-        dirs = [(0, 1), (1, 0), (1, 1), (1, -1)]
-        if piece == 'O':
-            for dr, dc in dirs:
-                if self._is_valid(r-dr, c-dc) and self.board[r-dr][c-dc]=='S' and self._is_valid(r+dr, c+dc) and self.board[r+dr][c+dc]=='S':
-                    found.append(((r-dr, c-dc), (r+dr, c+dc)))
-        elif piece == 'S':
-            for dr, dc in dirs:
-                if self._is_valid(r+2*dr, c+2*dc) and self.board[r+2*dr][c+2*dc]=='S' and self._is_valid(r+dr, c+dc) and self.board[r+dr][c+dc]=='O':
-                    found.append(((r, c), (r+2*dr, c+2*dc)))
-                if self._is_valid(r-2*dr, c-2*dc) and self.board[r-2*dr][c-2*dc]=='S' and self._is_valid(r-dr, c-dc) and self.board[r-dr][c-dc]=='O':
-                    found.append(((r-2*dr, c-2*dc), (r, c)))
-        return found
+        n = self.board_size
+        lines = sos_lines_at(self._cells, n, r * n + c, PIECE_CODES.get(piece, EMPTY))
+        return [(divmod(a, n), divmod(b, n)) for a, b in lines]
 
     @abstractmethod
     def make_move(self, r, c, piece): pass
+
+    # Takes back the last move, restoring turn, scores and game-over state
+    @abstractmethod
+    def undo_move(self): pass
     def get_turn_owner_name(self): return self.get_current_player().name
 
 class SimpleGame(SOSGameBase):
+    __slots__ = ()
+
     def make_move(self, r, c, piece):
-        if self.game_over or not self._is_valid(r, c) or self.board[r][c] != '': return [], False
-        self.board[r][c] = piece
-        self.history.append((r, c, piece))
+        if self.game_over or piece not in ('S', 'O') or not self.is_free(r, c): return [], False
+        self._place(r, c, piece)
         soses = self._check_for_sos(r, c, piece)
         if soses:
             self.game_over = True
@@ -200,15 +507,35 @@ class SimpleGame(SOSGameBase):
         self.current_turn_is_blue = not self.current_turn_is_blue
         return [], True
 
+    def undo_move(self):
+        if not self.history:
+            return False
+        r, c, _ = self.history[-1]
+        self._unplace(r, c)
+        # a move that ended the game never passed the turn
+        if not self.game_over:
+            self.current_turn_is_blue = not self.current_turn_is_blue
+        self.game_over = False
+        self.winner = None
+        return True
+
 class GeneralGame(SOSGameBase):
-    def __init__(self, size, blue, red):
-        super().__init__(size, blue, red)
+    __slots__ = ('blue_score', 'red_score')
+
+    def __init__(self, size, blue, red, compact=False, track_threats=False):
+        super().__init__(size, blue, red, compact, track_threats)
         self.blue_score = 0
         self.red_score = 0
+
+    def copy(self):
+        other = super().copy()
+        other.blue_score = self.blue_score
+        other.red_score = self.red_score
+        return other
+
     def make_move(self, r, c, piece):
-        if self.game_over or not self._is_valid(r, c) or self.board[r][c] != '': return [], False
-        self.board[r][c] = piece
-        self.history.append((r, c, piece))
+        if self.game_over or piece not in ('S', 'O') or not self.is_free(r, c): return [], False
+        self._place(r, c, piece)
         soses = self._check_for_sos(r, c, piece)
         if soses:
             pts = len(soses)
@@ -221,3 +548,19 @@ class GeneralGame(SOSGameBase):
             if self.blue_score > self.red_score: self.winner = "Blue"
             elif self.red_score > self.blue_score: self.winner = "Red"
         return soses, True
+
+    def undo_move(self):
+        if not self.history:
+            return False
+        r, c, piece = self.history[-1]
+        self._unplace(r, c)
+        # with the cell empty again the same lines are found, so the points are known
+        pts = len(self._check_for_sos(r, c, piece))
+        if pts:
+            if self.current_turn_is_blue: self.blue_score -= pts
+            else: self.red_score -= pts
+        else:
+            self.current_turn_is_blue = not self.current_turn_is_blue
+        self.game_over = False
+        self.winner = None
+        return True
@@ -1,5 +1,11 @@
+import os
+import random
+import tempfile
 import unittest
-from sosUtilities import is_sos, count_sos_in_board
+from unittest import mock
+import sosUtilities
+from sosUtilities import is_sos, count_sos_in_board, sos_triplets, sos_lines_at, encode_board, move_outlook, \
+    count_sos_by_direction, count_sos_in_rows, count_sos_in_file
 
 class TestSOSUtils(unittest.TestCase):
     def test_is_sos_basic(self):
@@ -29,6 +35,84 @@ class TestSOSUtils(unittest.TestCase):
         ]
         self.assertEqual(count_sos_in_board(board), 1)
 
+    def test_row_cleaning_matches_per_cell(self):
+        rng = random.Random(4)
+        odd = ["", "S", "O", " s ", "\tO\n", "x", "Sx", None, "\u00df", "\x1cS", "\x00S", ",", 0]
+        rows = [[rng.choice(odd) for _ in range(rng.randrange(12))] for _ in range(300)]
+        expected = [bytearray(sosUtilities._clean_cell(v) for v in row) for row in rows]
+        self.assertEqual([sosUtilities._clean_row(row) for row in rows], expected)
+        # the same without NumPy
+        with mock.patch.object(sosUtilities, "np", None):
+            self.assertEqual([sosUtilities._clean_row(row) for row in rows], expected)
+
+    def test_triplet_table_roles(self):
+        ends, middles = sos_triplets(4)
+        # a corner can only start a row, a column or a diagonal
+        self.assertEqual(len(ends[0]), 3)
+        self.assertEqual(middles[0], ())
+        # an inner cell of a 4x4 board is the middle of all four lines
+        self.assertEqual(len(middles[5]), 4)
+        self.assertIs(sos_triplets(4), sos_triplets(4))
+
+    def test_sos_lines_at(self):
+        board = [
+            ["S", "", "S"],
+            ["", "O", ""],
+            ["S", "", ""],
+        ]
+        cells = encode_board(board)
+        self.assertEqual(sos_lines_at(cells, 3, 1, 2), [(0, 2)])
+        self.assertEqual(sos_lines_at(cells, 3, 8, 1), [(0, 8)])
+        self.assertEqual(sos_lines_at(cells, 3, 7, 1), [])
+
+    def test_move_outlook(self):
+        cells = encode_board([
+            ["S", "", "", "S"],
+            ["", "", "", ""],
+            ["", "", "", ""],
+            ["", "", "", ""],
+        ])
+        # either gap of "S _ _ S" sets up the opponent whatever goes there
+        self.assertEqual(move_outlook(cells, 4, 1), (0, 0, 1, 1))
+        self.assertEqual(move_outlook(cells, 4, 14), (0, 0, 0, 0))
+
+    def test_large_board_paths_agree(self):
+        rng = random.Random(3)
+        board = [[rng.choice(["S", "O", "", " s", None]) for _ in range(60)] for _ in range(60)]
+        fast = count_sos_in_board(board)
+        with mock.patch.object(sosUtilities, "np", None):
+            slow = count_sos_in_board(board)
+        self.assertEqual(fast, slow)
+        self.assertGreater(slow, 0)
+
+    def test_count_by_direction(self):
+        board = [
+            ["S", "O", "S", ""],
+            ["", "S", "O", "S"],
+            ["S", "O", "S", ""],
+            ["", "", "", ""],
+        ]
+        self.assertEqual(count_sos_by_direction(board),
+                         {"row": 3, "column": 1, "diagonal": 0, "anti_diagonal": 0})
+
+    def test_streaming_matches_in_memory(self):
+        rng = random.Random(9)
+        board = [[rng.choice(["S", "O", "", " o", None]) for _ in range(12)] for _ in range(12)]
+        expected = count_sos_by_direction(board)
+        self.assertEqual(count_sos_in_rows(iter(board)), expected)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            text_path = os.path.join(tmp, "board.txt")
+            with open(text_path, "w") as f:
+                for row in board:
+                    f.write(",".join(v or "" for v in row) + "\n")
+            self.assertEqual(count_sos_in_file(text_path), expected)
+
+            bin_path = os.path.join(tmp, "board.bin")
+            with open(bin_path, "wb") as f:
+                f.write(encode_board(board))
+            self.assertEqual(count_sos_in_file(bin_path), expected)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,23 @@
+import argparse
+import sys
+
+import sos_analytics
+import sos_bench
+import sos_book
+import sos_tournament
+
+
+# Headless entry point: python -m sos <command> ...
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sos", description="Headless SOS tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    sos_tournament.add_arguments(commands.add_parser("tournament", help="batch self-play between two player types"))
+    sos_book.add_arguments(commands.add_parser("book", help="build an opening book / solved-position file"))
+    sos_analytics.add_arguments(commands.add_parser("stats", help="summarise game record files"))
+    sos_bench.add_arguments(commands.add_parser("bench", help="time engine operations across board sizes"))
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,44 +1,317 @@
-from typing import List
+import math
+import mmap
+import os
+import re
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # the pure-Python counter covers every size, just more slowly
+    np = None
+
+# Cell codes shared with the game engine's flat board (0 = empty)
+EMPTY, S_CODE, O_CODE = 0, 1, 2
+
+DIRECTION_NAMES = ("row", "column", "diagonal", "anti_diagonal")
+
+# Boards at least this wide are counted with NumPy when it is installed
+VECTORISE_MIN_SIZE = 32
+
+# Cell values that need no cleaning; anything else goes through strip/upper
+_FAST_CODES = {"": EMPTY, None: EMPTY, "S": S_CODE, "O": O_CODE, "s": S_CODE, "o": O_CODE}
+_UNKNOWN = 255
+
+# Flat-index offset pairs for one cell: ((mid, far), ...) as an end, ((a, b), ...) as the middle
+OffsetPairs = Tuple[Tuple[int, int], ...]
+
 
 def is_sos(line: str) -> bool:
     return line is not None and len(line) == 3 and line.upper() == "SOS"
 
 
-def count_sos_in_board(board: List[List[str]]) -> int:
+@lru_cache(maxsize=8)
+def sos_triplets(n: int) -> Tuple[List[OffsetPairs], List[OffsetPairs]]:
+    """Per-cell table of every line of three the cell belongs to on an n x n board.
+
+    Returns (ends, middles), both indexed by flat cell index r * n + c.
+    ends[i] holds (mid, far) offsets for lines where cell i is an S end,
+    middles[i] holds (a, b) offsets for lines where cell i is the O.
+    Cells only differ by how close they are to an edge, so the entries
+    are shared tuples and the table costs one pointer per cell.
+    """
+    dirs = ((0, 1), (1, 0), (1, 1), (1, -1))
+    steps = (-2, -1, 1, 2)
+
+    # which of the steps -2, -1, +1, +2 stay on the board from row/col i
+    def edge_key(i):
+        return tuple(0 <= i + s < n for s in steps)
+
+    def fits(r_key, c_key, dr, dc, k):
+        return ((dr * k == 0 or r_key[steps.index(dr * k)]) and
+                (dc * k == 0 or c_key[steps.index(dc * k)]))
+
+    @lru_cache(maxsize=None)
+    def cell_entry(r_key, c_key):
+        ends, middles = [], []
+        for dr, dc in dirs:
+            d = dr * n + dc
+            if fits(r_key, c_key, dr, dc, 1) and fits(r_key, c_key, dr, dc, 2):
+                ends.append((d, 2 * d))
+            if fits(r_key, c_key, dr, dc, -1) and fits(r_key, c_key, dr, dc, -2):
+                ends.append((-d, -2 * d))
+            if fits(r_key, c_key, dr, dc, -1) and fits(r_key, c_key, dr, dc, 1):
+                middles.append((-d, d))
+        return tuple(ends), tuple(middles)
+
+    col_keys = [edge_key(c) for c in range(n)]
+    row_templates = {}
+    ends_table: List[OffsetPairs] = []
+    middles_table: List[OffsetPairs] = []
+    for r in range(n):
+        r_key = edge_key(r)
+        if r_key not in row_templates:
+            entries = [cell_entry(r_key, c_key) for c_key in col_keys]
+            row_templates[r_key] = ([e for e, _ in entries], [m for _, m in entries])
+        row_ends, row_middles = row_templates[r_key]
+        ends_table.extend(row_ends)
+        middles_table.extend(row_middles)
+    return ends_table, middles_table
+
+
+def sos_lines_at(cells: Sequence[int], n: int, idx: int, code: int) -> List[Tuple[int, int]]:
+    """Lines that putting `code` on cell idx would complete, as (start, end) flat indices.
+
+    Cell idx itself is never read, so this works both before and after the
+    piece is placed.
+    """
+    ends, middles = sos_triplets(n)
+    if code == O_CODE:
+        return [(idx + a, idx + b) for a, b in middles[idx]
+                if cells[idx + a] == S_CODE and cells[idx + b] == S_CODE]
+    if code == S_CODE:
+        return [(min(idx, idx + far), max(idx, idx + far)) for mid, far in ends[idx]
+                if cells[idx + mid] == O_CODE and cells[idx + far] == S_CODE]
+    return []
+
+
+def move_outlook(cells: Sequence[int], n: int, idx: int) -> Tuple[int, int, int, int]:
+    """What an S or an O on empty cell idx would do: (s_points, o_points, s_setups, o_setups).
+
+    Points are the SOSes the move completes. Setups are lines the move
+    leaves one piece short of an SOS, i.e. free points for whoever moves
+    next (this is what makes both gaps of "S _ _ S" poison).
+    """
+    ends, middles = sos_triplets(n)
+    s_points = o_points = s_setups = o_setups = 0
+    for mid, far in ends[idx]:
+        m, f = cells[idx + mid], cells[idx + far]
+        if m == O_CODE:
+            if f == S_CODE:
+                s_points += 1
+            elif f == EMPTY:
+                s_setups += 1
+        elif m == EMPTY and f == S_CODE:
+            s_setups += 1
+    for a, b in middles[idx]:
+        x, y = cells[idx + a], cells[idx + b]
+        if x == S_CODE:
+            if y == S_CODE:
+                o_points += 1
+            elif y == EMPTY:
+                o_setups += 1
+        elif x == EMPTY and y == S_CODE:
+            o_setups += 1
+    return s_points, o_points, s_setups, o_setups
+
+
+def _clean_cell(v) -> int:
+    return {"S": S_CODE, "O": O_CODE}.get((v or "").strip().upper()[:1], EMPTY)
+
+
+# For ASCII, _clean_cell only looks at a cell's first non-blank character, so a whole
+# row is cleaned by deleting the blanks and reading the byte after every separator
+_BLANKS = bytes(i for i in range(128) if chr(i).isspace())
+_FIRST_BYTE_CODES = {b"S": S_CODE, b"s": S_CODE, b"O": O_CODE, b"o": O_CODE}
+_BYTE_CODES = bytes(S_CODE if chr(i) in "Ss" else O_CODE if chr(i) in "Oo" else EMPTY for i in range(256))
+
+
+@lru_cache(maxsize=4)
+def _first_bytes(sep: bytes) -> "re.Pattern":
+    sep = re.escape(sep)
+    return re.compile(b"(?:^|" + sep + b")([^" + sep + b"]?)")
+
+
+def _first_byte_codes(data: bytes, sep: bytes) -> bytearray:
+    data = data.translate(None, _BLANKS)
+    if np is None:
+        firsts = _first_bytes(sep).findall(data)
+        return bytearray(map(_FIRST_BYTE_CODES.get, firsts, repeat(EMPTY)))
+    # the byte after each separator (or the closing one after the last) through a code table;
+    # an empty cell's "first byte" is the next separator, which maps to EMPTY
+    raw = np.frombuffer(data.translate(_BYTE_CODES) + b"\0", dtype=np.uint8)
+    starts = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == sep[0]) + 1
+    return bytearray(raw[np.concatenate(([0], starts))].tobytes())
+
+
+def _clean_row(row: Sequence[str]) -> bytearray:
+    """_clean_cell over a row, in a few C-level passes unless a cell is odder than ASCII text or None."""
+    try:
+        text = "\0".join(row)
+    except TypeError:
+        try:
+            text = "\0".join([v or "" for v in row])
+        except TypeError:
+            text = None
+    if text is not None and text.isascii():
+        codes = _first_byte_codes(text.encode("ascii"), b"\0")
+        # a cell holding the separator itself would throw the count out
+        if len(codes) == len(row):
+            return codes
+    return bytearray(_clean_cell(v) for v in row)
+
+
+def encode_board(board: List[List[str]]) -> bytearray:
+    """Flattens a loosely written board into cell codes (whitespace, case and None tolerated)."""
+    n = len(board)
+    cells = bytearray()
+    for row in board:
+        row = row[:n]
+        # plain "", "S", "O" cells are mapped in C; only odd ones are cleaned by hand
+        codes = bytearray(map(_FAST_CODES.get, row, repeat(_UNKNOWN)))
+        if _UNKNOWN in codes:
+            codes = _clean_row(row)
+        cells += codes
+        cells += bytes(n - len(row))
+    return cells
+
+
+def _count_sos_numpy(cells: bytearray, n: int) -> Dict[str, int]:
+    grid = np.frombuffer(cells, dtype=np.int8).reshape(n, n)
+    s = grid == S_CODE
+    o = grid == O_CODE
+    return {
+        "row": int(np.count_nonzero(s[:, :-2] & o[:, 1:-1] & s[:, 2:])),
+        "column": int(np.count_nonzero(s[:-2] & o[1:-1] & s[2:])),
+        "diagonal": int(np.count_nonzero(s[:-2, :-2] & o[1:-1, 1:-1] & s[2:, 2:])),
+        "anti_diagonal": int(np.count_nonzero(s[:-2, 2:] & o[1:-1, 1:-1] & s[2:, :-2])),
+    }
+
+
+def _count_sos_python(cells: bytearray, n: int) -> Dict[str, int]:
+    _, middles = sos_triplets(n)
+    # the far offset of a middle pair tells the direction
+    names = {1: "row", n: "column", n + 1: "diagonal", n - 1: "anti_diagonal"}
+    counts = dict.fromkeys(DIRECTION_NAMES, 0)
+
+    # every line of three has exactly one middle, so counting from the O's sees each once
+    for idx in range(n * n):
+        if cells[idx] == O_CODE:
+            for a, b in middles[idx]:
+                if cells[idx + a] == S_CODE and cells[idx + b] == S_CODE:
+                    counts[names[b]] += 1
+    return counts
+
+
+def count_sos_by_direction(board: List[List[str]]) -> Dict[str, int]:
+    """SOS counts split into "row", "column", "diagonal" and "anti_diagonal"."""
     if not board:
-        return 0
+        return dict.fromkeys(DIRECTION_NAMES, 0)
 
     n = len(board)
+    cells = encode_board(board)
+    if np is not None and n >= VECTORISE_MIN_SIZE:
+        return _count_sos_numpy(cells, n)
+    return _count_sos_python(cells, n)
 
-    def cell(r, c):
-        v = board[r][c] if 0 <= r < n and 0 <= c < n else None
-        return (v or "").strip().upper()[:1]
 
-    total = 0
+def count_sos_in_board(board: List[List[str]]) -> int:
+    return sum(count_sos_by_direction(board).values())
 
-#row and column
-    for r in range(n):
-        for c in range(n - 2):
-            row_str = cell(r, c) + cell(r, c + 1) + cell(r, c + 2)
-            if is_sos(row_str):
-                total += 1
-    for c in range(n):
-        for r in range(n - 2):
-            col_str = cell(r, c) + cell(r + 1, c) + cell(r + 2, c)
-            if is_sos(col_str):
-                total += 1
-
-# Diagonal
-    for r in range(n - 2):
-        for c in range(n - 2):
-            dr = cell(r, c) + cell(r + 1, c + 1) + cell(r + 2, c + 2)
-            if is_sos(dr):
-                total += 1
-    for r in range(n - 2):
-        for c in range(2, n):
-            dl = cell(r, c) + cell(r + 1, c - 1) + cell(r + 2, c - 2)
-            if is_sos(dl):
-                total += 1
-
-    return total
 
+# Streaming: rows become S and O bitmasks (bit c = column c), so a window of three
+# rows is counted with a few big-int ANDs and bit_count() and memory stays O(width).
+_S_BITS = bytes(0x31 if i == S_CODE else 0x30 for i in range(256))
+_O_BITS = bytes(0x31 if i == O_CODE else 0x30 for i in range(256))
+
+
+def _row_masks(codes: bytes) -> Tuple[int, int]:
+    if not codes:
+        return 0, 0
+    return int(codes.translate(_S_BITS)[::-1], 2), int(codes.translate(_O_BITS)[::-1], 2)
+
+
+def _count_code_rows(code_rows: Iterable[bytes], width: int = None) -> Dict[str, int]:
+    counts = dict.fromkeys(DIRECTION_NAMES, 0)
+    window = []
+    for codes in code_rows:
+        if width is None:
+            width = len(codes)
+        codes = bytes(codes[:width]).ljust(width, b"\0")
+        s, o = _row_masks(codes)
+        counts["row"] += (s & (o >> 1) & (s >> 2)).bit_count()
+        window.append((s, o))
+        if len(window) > 3:
+            window.pop(0)
+        if len(window) == 3:
+            (s0, _), (_, o1), (s2, _) = window
+            counts["column"] += (s0 & o1 & s2).bit_count()
+            counts["diagonal"] += (s0 & (o1 >> 1) & (s2 >> 2)).bit_count()
+            counts["anti_diagonal"] += (s0 & (o1 << 1) & (s2 << 2)).bit_count()
+    return counts
+
+
+def count_sos_in_rows(rows: Iterable[Sequence[str]], width: int = None) -> Dict[str, int]:
+    """Per-direction SOS counts over any iterator of rows, holding three rows at a time.
+
+    Cells are cleaned like count_sos_in_board. The width defaults to the
+    first row's length; longer rows are cut and shorter ones padded.
+    """
+    def encoded():
+        for row in rows:
+            row = list(row) if width is None else list(row)[:width]
+            codes = bytearray(map(_FAST_CODES.get, row, repeat(_UNKNOWN)))
+            if _UNKNOWN in codes:
+                codes = _clean_row(row)
+            yield codes
+    return _count_code_rows(encoded(), width)
+
+
+_TEXT_CODES = bytes(S_CODE if chr(i) in "Ss" else O_CODE if chr(i) in "Oo" else EMPTY for i in range(256))
+
+
+def _text_row_codes(line: bytes) -> bytes:
+    line = line.rstrip(b"\r\n")
+    if b"," in line:
+        if line.isascii():
+            return bytes(_first_byte_codes(line, b","))
+        return bytes(_clean_cell(v.decode("utf-8", "replace")) for v in line.split(b","))
+    return line.translate(_TEXT_CODES)
+
+
+def count_sos_in_file(path: str, width: int = None, binary: bool = None) -> Dict[str, int]:
+    """Per-direction SOS counts for a board file, read through mmap one row at a time.
+
+    Text boards have one row per line, either one character per cell
+    ("S", "O", anything else empty) or comma-separated cells. Binary
+    boards are raw row-major cell codes (0 empty, 1 S, 2 O); their width
+    defaults to the square root of the file size. binary=None guesses
+    from the first 4 KiB.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return dict.fromkeys(DIRECTION_NAMES, 0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if binary is None:
+                binary = all(b <= O_CODE for b in mm[:4096])
+            if binary:
+                if width is None:
+                    width = math.isqrt(size)
+                    if width * width != size:
+                        raise ValueError(f"{path}: {size} bytes is not a square board; pass width")
+                rows = (mm[i:i + width] for i in range(0, size, width))
+            else:
+                rows = (_text_row_codes(line) for line in iter(mm.readline, b""))
+            return _count_code_rows(rows, width)
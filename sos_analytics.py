@@ -0,0 +1,150 @@
+import csv
+import json
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from sos_records import iter_records, record_count
+
+
+class GameStats:
+    """Single-pass aggregates over game records; partial results from chunks merge()."""
+    __slots__ = ('games', 'by_type', 'first_mover', 'general_games', 'general_points', 'general_moves',
+                 'lengths', 'openings')
+
+    def __init__(self):
+        self.games = 0
+        # player type -> Counter of "games", "wins", "losses", "draws"
+        self.by_type = {}
+        # Blue always moves first, so this is Blue's results
+        self.first_mover = Counter()
+        self.general_games = self.general_points = self.general_moves = 0
+        self.lengths = Counter()
+        # board size -> Counter of the first move's (row, col)
+        self.openings = {}
+
+    def add(self, record):
+        self.games += 1
+        for kind, side in ((record.blue_type, "Blue"), (record.red_type, "Red")):
+            tally = self.by_type.setdefault(kind, Counter())
+            tally["games"] += 1
+            if record.winner is None:
+                tally["draws"] += 1
+            elif record.winner == side:
+                tally["wins"] += 1
+            else:
+                tally["losses"] += 1
+        self.first_mover["wins" if record.winner == "Blue" else "draws" if record.winner is None else "losses"] += 1
+        if record.mode == "general":
+            self.general_games += 1
+            self.general_points += record.blue_score + record.red_score
+            self.general_moves += len(record.moves)
+        self.lengths[len(record.moves)] += 1
+        if record.moves:
+            r, c, _ = record.moves[0]
+            self.openings.setdefault(record.size, Counter())[r, c] += 1
+
+    def merge(self, other):
+        self.games += other.games
+        for kind, tally in other.by_type.items():
+            self.by_type.setdefault(kind, Counter()).update(tally)
+        self.first_mover.update(other.first_mover)
+        self.general_games += other.general_games
+        self.general_points += other.general_points
+        self.general_moves += other.general_moves
+        self.lengths.update(other.lengths)
+        for size, counts in other.openings.items():
+            self.openings.setdefault(size, Counter()).update(counts)
+        return self
+
+    def to_dict(self, top=10):
+        def rates(tally):
+            games = tally["games"] or 1
+            return {"games": tally["games"], "wins": tally["wins"], "losses": tally["losses"], "draws": tally["draws"],
+                    "win_rate": tally["wins"] / games}
+        first = Counter(self.first_mover, games=self.games)
+        total_moves = sum(length * n for length, n in self.lengths.items())
+        return {
+            "games": self.games,
+            "by_player_type": {kind: rates(tally) for kind, tally in sorted(self.by_type.items())},
+            "first_mover": rates(first),
+            "general": {"games": self.general_games, "points": self.general_points, "moves": self.general_moves,
+                        "points_per_move": self.general_points / self.general_moves if self.general_moves else 0.0},
+            "length": {"mean": total_moves / self.games if self.games else 0.0,
+                       "min": min(self.lengths, default=0), "max": max(self.lengths, default=0),
+                       "histogram": {str(length): n for length, n in sorted(self.lengths.items())}},
+            "openings": {str(size): [{"row": r, "col": c, "games": n} for (r, c), n in counts.most_common(top)]
+                         for size, counts in sorted(self.openings.items())},
+        }
+
+
+def _chunk_stats(task):
+    path, start, stop = task
+    stats = GameStats()
+    for record in iter_records(path, start, stop):
+        stats.add(record)
+    return stats
+
+
+# Aggregates one or more record files; with workers > 1 each file is cut into chunks of
+# `chunk` games that are counted in separate processes and merged.
+def analyse(paths, workers=1, chunk=10000):
+    tasks = []
+    for path in paths:
+        count = record_count(path)
+        tasks.extend((path, start, min(start + chunk, count)) for start in range(0, count, chunk))
+    stats = GameStats()
+    if workers == 1:
+        for task in tasks:
+            stats.merge(_chunk_stats(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(_chunk_stats, tasks):
+                stats.merge(part)
+    return stats
+
+
+# Flattens the summary into section,key,value rows
+def write_csv(summary, out):
+    writer = csv.writer(out)
+    writer.writerow(("section", "key", "value"))
+    writer.writerow(("games", "", summary["games"]))
+    for kind, tally in summary["by_player_type"].items():
+        for key, value in tally.items():
+            writer.writerow((f"player_type:{kind}", key, value))
+    for key, value in summary["first_mover"].items():
+        writer.writerow(("first_mover", key, value))
+    for key, value in summary["general"].items():
+        writer.writerow(("general", key, value))
+    for key in ("mean", "min", "max"):
+        writer.writerow(("length", key, summary["length"][key]))
+    for length, n in summary["length"]["histogram"].items():
+        writer.writerow(("length_histogram", length, n))
+    for size, cells in summary["openings"].items():
+        for cell in cells:
+            writer.writerow((f"openings:{size}x{size}", f"{cell['row']},{cell['col']}", cell["games"]))
+
+
+def add_arguments(parser):
+    parser.add_argument("records", nargs="+", help="game record files")
+    parser.add_argument("-f", "--format", choices=("json", "csv"), default="json")
+    parser.add_argument("-o", "--output", help="write here instead of stdout")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="processes to spread chunks over")
+    parser.add_argument("--chunk", type=int, default=10000, help="games per chunk")
+    parser.add_argument("--top", type=int, default=10, help="opening cells listed per board size")
+    parser.set_defaults(func=main)
+
+
+def main(args):
+    summary = analyse(args.records, args.workers, args.chunk).to_dict(args.top)
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump(summary, out, indent=2)
+            out.write("\n")
+        else:
+            write_csv(summary, out)
+    finally:
+        if args.output:
+            out.close()
+    return 0
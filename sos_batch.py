@@ -0,0 +1,135 @@
+import numpy as np
+
+from sosUtilities import EMPTY, S_CODE, O_CODE
+
+# (dr, dc) for the four line directions; S checks both signs, O checks across itself
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+PAD = 2
+
+NO_WINNER, BLUE_WINS, RED_WINS = 0, 1, 2
+
+
+class BatchGames:
+    """N games of the same size and mode played in lockstep on one int8 array.
+
+    Each step applies at most one move per game with vectorised gathers,
+    following the same rules as SimpleGame (first SOS wins) and
+    GeneralGame (SOS scores and keeps the turn, full board ends it).
+    Cells use the engine's codes: 0 empty, 1 S, 2 O.
+    """
+
+    def __init__(self, count, size, mode="simple", seed=None):
+        if mode not in ("simple", "general"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.count = count
+        self.size = size
+        self.simple = mode == "simple"
+        self.rng = np.random.default_rng(seed)
+        # two cells of empty padding on every side so neighbour lookups never go out of bounds
+        self._padded = np.zeros((count, size + 2 * PAD, size + 2 * PAD), dtype=np.int8)
+        self.blue_turn = np.ones(count, dtype=bool)
+        self.blue_score = np.zeros(count, dtype=np.int32)
+        self.red_score = np.zeros(count, dtype=np.int32)
+        self.moves_made = np.zeros(count, dtype=np.int32)
+        self.game_over = np.zeros(count, dtype=bool)
+        self.winner = np.zeros(count, dtype=np.int8)
+        self._ids = np.arange(count)
+        # each game walks its own random permutation of the cells for random moves; the
+        # cursor only ever steps past filled cells, so it always rests on an empty one
+        self._order = np.argsort(self.rng.random((count, size * size)), axis=1).astype(np.int32)
+        self._cursor = np.zeros(count, dtype=np.int32)
+
+    @property
+    def boards(self):
+        return self._padded[:, PAD:-PAD, PAD:-PAD]
+
+    def active(self):
+        return ~self.game_over
+
+    # SOSes completed by putting pieces[i] on (rows[i], cols[i]) in games ids[i]
+    def _new_sos(self, ids, rows, cols, pieces):
+        b = self._padded
+        r = rows + PAD
+        c = cols + PAD
+        found = np.zeros(len(ids), dtype=np.int32)
+        is_s = pieces == S_CODE
+        is_o = pieces == O_CODE
+        for dr, dc in DIRECTIONS:
+            before = b[ids, r - dr, c - dc]
+            after = b[ids, r + dr, c + dc]
+            found += is_o & (before == S_CODE) & (after == S_CODE)
+            found += is_s & (after == O_CODE) & (b[ids, r + 2 * dr, c + 2 * dc] == S_CODE)
+            found += is_s & (before == O_CODE) & (b[ids, r - 2 * dr, c - 2 * dc] == S_CODE)
+        return found
+
+    def step(self, rows, cols, pieces):
+        """Applies one move per game (arrays of length N); finished games are skipped.
+
+        Returns the number of SOSes each game's move completed. Raises
+        ValueError if an unfinished game is given an occupied cell.
+        """
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        pieces = np.asarray(pieces, dtype=np.int8)
+        ids = self._ids[~self.game_over]
+        rows, cols, pieces = rows[ids], cols[ids], pieces[ids]
+        if np.any(self._padded[ids, rows + PAD, cols + PAD] != EMPTY):
+            raise ValueError("move onto an occupied cell")
+
+        found = self._new_sos(ids, rows, cols, pieces)
+        self._padded[ids, rows + PAD, cols + PAD] = pieces
+        self.moves_made[ids] += 1
+        full = self.moves_made[ids] == self.size * self.size
+        scored = found > 0
+        blue = self.blue_turn[ids]
+
+        if self.simple:
+            self.winner[ids[scored & blue]] = BLUE_WINS
+            self.winner[ids[scored & ~blue]] = RED_WINS
+            self.game_over[ids[scored | full]] = True
+            passing = ~scored & ~full
+        else:
+            self.blue_score[ids] += np.where(blue, found, 0)
+            self.red_score[ids] += np.where(blue, 0, found)
+            done = ids[full]
+            self.game_over[done] = True
+            self.winner[done] = np.where(self.blue_score[done] > self.red_score[done], BLUE_WINS,
+                                         np.where(self.red_score[done] > self.blue_score[done], RED_WINS, NO_WINNER))
+            passing = ~scored
+        self.blue_turn[ids[passing]] = ~blue[passing]
+
+        out = np.zeros(self.count, dtype=np.int32)
+        out[ids] = found
+        return out
+
+    def random_moves(self):
+        """A uniformly random empty cell and piece for every game (junk for finished games)."""
+        n = self.size
+        live = ~self.game_over
+        cursor = np.minimum(self._cursor, n * n - 1)
+        cell = self._order[self._ids, cursor]
+        flat = self._padded[:, PAD:-PAD, PAD:-PAD].reshape(self.count, n * n)
+        # skip cells filled since the last call, whether or not this walk proposed them
+        stale = live & (flat[self._ids, cell] != EMPTY)
+        while stale.any():
+            self._cursor[stale] += 1
+            cursor = np.minimum(self._cursor, n * n - 1)
+            cell = self._order[self._ids, cursor]
+            stale = live & (flat[self._ids, cell] != EMPTY)
+        pieces = self.rng.integers(S_CODE, O_CODE + 1, size=self.count, dtype=np.int8)
+        return cell // n, cell % n, pieces
+
+    def play_random(self):
+        """Plays every game out with random moves; returns the number of moves made."""
+        before = int(self.moves_made.sum())
+        while not self.game_over.all():
+            self.step(*self.random_moves())
+        return int(self.moves_made.sum()) - before
+
+    def results(self):
+        return {
+            "blue_wins": int(np.sum(self.winner == BLUE_WINS)),
+            "red_wins": int(np.sum(self.winner == RED_WINS)),
+            "draws": int(np.sum(self.game_over & (self.winner == NO_WINNER))),
+            "unfinished": int(np.sum(~self.game_over)),
+        }
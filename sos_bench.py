@@ -0,0 +1,208 @@
+import json
+import platform
+import random
+import sys
+import time
+
+import SosGame
+from SosGame import GeneralGame, ComputerPlayer, HumanPlayer
+from sosUtilities import count_sos_in_board
+
+DEFAULT_SIZES = (3, 5, 10, 25, 50, 100, 250, 500)
+OPERATIONS = ("make_move", "is_board_full", "check_for_sos", "count_sos_in_board", "random_game", "computer_get_move")
+
+
+def _players():
+    return HumanPlayer("Blue", "S"), HumanPlayer("Red", "S")
+
+
+# A general game with `fraction` of the board filled at random (general games don't stop at the first SOS)
+def _filled_game(n, fraction, rng):
+    game = GeneralGame(n, *_players())
+    for _ in range(int(n * n * fraction)):
+        r, c = game.random_free_cell(rng)
+        game.make_move(r, c, rng.choice("SO"))
+    return game
+
+
+def _random_board(n, rng):
+    return [[rng.choice(("S", "O", "")) for _ in range(n)] for _ in range(n)]
+
+
+# Each setup returns (run, ops): run() does `ops` operations and is what gets timed
+def _setup_make_move(n, rng):
+    moves = [(r, c, rng.choice("SO")) for r in range(n) for c in range(n)]
+    rng.shuffle(moves)
+
+    def run():
+        game = GeneralGame(n, *_players())
+        for r, c, piece in moves:
+            game.make_move(r, c, piece)
+    return run, len(moves)
+
+
+def _setup_is_board_full(n, rng):
+    game = _filled_game(n, 0.5, rng)
+
+    def run():
+        for _ in range(1000):
+            game.is_board_full()
+    return run, 1000
+
+
+def _setup_check_for_sos(n, rng):
+    game = _filled_game(n, 0.5, rng)
+    cells = [(r, c, game.cell(r, c)) for r, c, _ in game.history]
+    cells = [cells[i % len(cells)] for i in range(1000)]
+
+    def run():
+        for r, c, piece in cells:
+            game._check_for_sos(r, c, piece)
+    return run, len(cells)
+
+
+def _setup_count_sos_in_board(n, rng):
+    board = _random_board(n, rng)
+    return (lambda: count_sos_in_board(board)), 1
+
+
+# A general game, so it is always played until the board is full
+def _setup_random_game(n, rng):
+    seed = rng.random()
+
+    def run():
+        game_rng = random.Random(seed)
+        game = GeneralGame(n, *_players())
+        while not game.game_over:
+            r, c = game.random_free_cell(game_rng)
+            game.make_move(r, c, game_rng.choice("SO"))
+    return run, 1
+
+
+def _setup_computer_get_move(n, rng):
+    game = _filled_game(n, 0.5, rng)
+    player = ComputerPlayer("Blue", "S", verbose=False)
+
+    def run():
+        for _ in range(10):
+            player.get_move(game)
+    return run, 10
+
+
+SETUPS = {
+    "make_move": _setup_make_move,
+    "is_board_full": _setup_is_board_full,
+    "check_for_sos": _setup_check_for_sos,
+    "count_sos_in_board": _setup_count_sos_in_board,
+    "random_game": _setup_random_game,
+    "computer_get_move": _setup_computer_get_move,
+}
+
+
+# Best-of-`repeats` nanoseconds per operation; each repeat loops run() for at least min_time seconds
+def time_operation(run, ops, repeats=3, min_time=0.05):
+    best = None
+    for _ in range(repeats):
+        loops, start = 0, time.perf_counter()
+        while True:
+            run()
+            loops += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        per_op = elapsed / (loops * ops) * 1e9
+        best = per_op if best is None else min(best, per_op)
+    return best
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, operations=OPERATIONS, repeats=3, min_time=0.05, seed=0, progress=None):
+    """Times every operation at every board size; returns the JSON-ready result document.
+
+    The ComputerPlayer is always benchmarked on its fallback path: the API
+    key is blanked for the run, so nothing here touches the network.
+    """
+    saved_key = SosGame.CLAUDE_API_KEY
+    SosGame.CLAUDE_API_KEY = ""
+    results = {}
+    try:
+        for op in operations:
+            for n in sizes:
+                rng = random.Random(seed * 7919 + n)
+                run, ops = SETUPS[op](n, rng)
+                ns = time_operation(run, ops, repeats, min_time)
+                results.setdefault(op, {})[str(n)] = ns
+                if progress is not None:
+                    progress(op, n, ns)
+    finally:
+        SosGame.CLAUDE_API_KEY = saved_key
+    return {
+        "meta": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                 "machine": platform.machine(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "repeats": repeats, "min_time": min_time, "seed": seed},
+        "unit": "ns/op",
+        "results": results,
+    }
+
+
+# (op, size, baseline ns, current ns, percent slower) for everything past `threshold` percent
+def compare(current, baseline, threshold=10.0):
+    regressions = []
+    for op, sizes in current["results"].items():
+        for size, ns in sizes.items():
+            base = baseline["results"].get(op, {}).get(size)
+            if base:
+                slower = (ns / base - 1) * 100
+                if slower > threshold:
+                    regressions.append((op, int(size), base, ns, slower))
+    return regressions
+
+
+def _format_ns(ns):
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def add_arguments(parser):
+    parser.add_argument("--sizes", type=lambda s: tuple(int(v) for v in s.split(",")), default=DEFAULT_SIZES,
+                        help="comma-separated board sizes (default 3..500)")
+    parser.add_argument("--ops", type=lambda s: tuple(s.split(",")), default=OPERATIONS,
+                        help="comma-separated operations: " + ",".join(OPERATIONS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds each repeat runs for at least")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="write the results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent slowdown that counts as a regression")
+    parser.set_defaults(func=main)
+
+
+def main(args):
+    unknown = set(args.ops) - set(OPERATIONS)
+    if unknown:
+        print(f"Unknown operations: {', '.join(sorted(unknown))}")
+        return 2
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    def progress(op, n, ns):
+        line = f"{op:20} {n:>4}x{n:<4} {_format_ns(ns):>12}/op"
+        base = baseline and baseline["results"].get(op, {}).get(str(n))
+        if base:
+            line += f"  ({(ns / base - 1) * 100:+.1f}%)"
+        print(line, flush=True)
+
+    result = run_benchmarks(args.sizes, args.ops, args.repeats, args.min_time, args.seed, progress)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if baseline is None:
+        return 0
+
+    regressions = compare(result, baseline, args.threshold)
+    for op, n, base, ns, slower in regressions:
+        print(f"REGRESSION {op} {n}x{n}: {_format_ns(base)} -> {_format_ns(ns)} ({slower:+.1f}%)", file=sys.stderr)
+    return 1 if regressions else 0
@@ -0,0 +1,210 @@
+import mmap
+import struct
+import time
+
+from SosGame import SimpleGame, GeneralGame, HumanPlayer
+from sos_search import AlphaBetaPlayer
+from sos_symmetry import canonical_key, from_canonical, to_canonical
+
+MAGIC = b"SOSBOOK1"
+HEADER = struct.Struct("<8sQ")
+# canonical key, canonical cell index, piece (0 = S, 1 = O), value for the side to move
+RECORD = struct.Struct("<QHBb")
+PIECES = "SO"
+# --search covers this many moves from the start unless --plies says otherwise
+SEARCH_PLIES = 2
+
+
+# Mixes board size and mode into the position hash; an empty board hashes to 0 for every size
+def _salt(n, mode):
+    x = (n * 0x9E3779B97F4A7C15 + (1 if mode == "general" else 2) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    x ^= x >> 31
+    return (x * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+
+
+def book_key(game):
+    key, t = canonical_key(game)
+    mode = "simple" if isinstance(game, SimpleGame) else "general"
+    return key ^ _salt(game.board_size, mode), t
+
+
+class OpeningBook:
+    """Read side of a book file, looked up straight from an mmap.
+
+    Records are sorted by key, so a lookup is a binary search over the
+    mapped file with struct.unpack_from: nothing is loaded at start-up and
+    open time doesn't grow with the book.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an SOS opening book")
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return self.count
+
+    def _find(self, key):
+        lo, hi = 0, self.count
+        mm = self._mm
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = HEADER.size + mid * RECORD.size
+            mid_key = struct.unpack_from("<Q", mm, offset)[0]
+            if mid_key < key:
+                lo = mid + 1
+            elif mid_key > key:
+                hi = mid
+            else:
+                return RECORD.unpack_from(mm, offset)
+        return None
+
+    def lookup(self, game):
+        """(row, col, piece, value) on the real board, or None when the position isn't in the book."""
+        key, t = book_key(game)
+        record = self._find(key)
+        if record is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        _, cell, piece, value = record
+        n = game.board_size
+        r, c, p = from_canonical((cell // n, cell % n, PIECES[piece]), t, n)
+        if not game.is_free(r, c):
+            return None
+        return r, c, p, value
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+# Exhaustive negamax over canonical positions; fills `entries` with key -> (cell, piece, value)
+# for every reachable position at most max_plies into the game. A position's ply is its piece
+# count, so it is the same wherever the position turns up again in the memo.
+def _solve(game, simple, memo, entries, ply, max_plies):
+    key, t = book_key(game)
+    if key in memo:
+        return memo[key]
+
+    n = game.board_size
+    best_value, best_move = None, None
+    for r, c in list(game.legal_moves()):
+        for piece in PIECES:
+            mover = game.current_turn_is_blue
+            soses, _ = game.make_move(r, c, piece)
+            if simple:
+                if soses:
+                    value = 1
+                elif game.game_over:
+                    value = 0
+                else:
+                    value = -_solve(game, simple, memo, entries, ply + 1, max_plies)
+            else:
+                value = len(soses)
+                if not game.game_over:
+                    child = _solve(game, simple, memo, entries, ply + 1, max_plies)
+                    value += child if game.current_turn_is_blue == mover else -child
+            game.undo_move()
+            if best_value is None or value > best_value:
+                best_value, best_move = value, (r, c, piece)
+        # a win can't be bettered, but siblings inside the book's range still need their own entries
+        if simple and best_value == 1 and max_plies is not None and ply >= max_plies:
+            break
+
+    memo[key] = best_value
+    if max_plies is None or ply <= max_plies:
+        cr, cc, piece = to_canonical(best_move, t, n)
+        entries[key] = (cr * n + cc, PIECES.index(piece), max(-128, min(127, best_value)))
+    return best_value
+
+
+def _new_game(size, mode):
+    cls = SimpleGame if mode == "simple" else GeneralGame
+    return cls(size, HumanPlayer("Blue", "S"), HumanPlayer("Red", "S"))
+
+
+def solve_positions(size, mode, max_plies=None):
+    """Solves every reachable position exhaustively.
+
+    Whole boards are only practical up to 3x3; 4x4 simple needs max_plies,
+    since past it a won position stops at its first winning move.
+    """
+    entries = {}
+    _solve(_new_game(size, mode), mode == "simple", {}, entries, 0, max_plies)
+    return entries
+
+
+def search_positions(size, mode, plies, time_limit=1.0):
+    """Book entries for every canonical position in the first `plies` moves, each searched with alpha-beta.
+
+    There are roughly (2n^2)^plies / 8 such positions and each can take
+    time_limit, so this suits the first two or three moves of a board.
+    """
+    entries = {}
+    searcher = AlphaBetaPlayer("Book", "S", time_limit=time_limit)
+    frontier = [_new_game(size, mode)]
+    seen = set()
+    for depth in range(plies + 1):
+        following = []
+        for game in frontier:
+            key, t = book_key(game)
+            if key in seen or game.game_over:
+                continue
+            seen.add(key)
+            move = searcher.get_move(game)
+            # a search that ran out of time before finishing depth 1 has no value to store
+            if searcher.last_value is not None:
+                cr, cc, piece = to_canonical(move, t, size)
+                entries[key] = (cr * size + cc, PIECES.index(piece), max(-128, min(127, searcher.last_value)))
+            # positions on the last ply are searched but never expanded
+            if depth == plies:
+                continue
+            for r, c in list(game.legal_moves()):
+                for p in PIECES:
+                    child = game.copy()
+                    child.make_move(r, c, p)
+                    following.append(child)
+        frontier = following
+    return entries
+
+
+def write_book(path, entries):
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(entries)))
+        for key in sorted(entries):
+            cell, piece, value = entries[key]
+            f.write(RECORD.pack(key, cell, piece, value))
+
+
+def add_arguments(parser):
+    parser.add_argument("output", help="book file to write")
+    parser.add_argument("boards", nargs="+", metavar="SIZE:MODE", help="e.g. 3:simple 3:general 4:simple")
+    parser.add_argument("--plies", type=int, default=None,
+                        help=f"only keep (or, with --search, only search) this many moves from the start "
+                             f"(--search default: {SEARCH_PLIES})")
+    parser.add_argument("--search", action="store_true", help="use timed alpha-beta instead of solving exhaustively")
+    parser.add_argument("--time-limit", type=float, default=1.0, help="seconds per position with --search")
+    parser.set_defaults(func=main)
+
+
+def main(args):
+    entries = {}
+    for spec in args.boards:
+        size, _, mode = spec.partition(":")
+        size, mode = int(size), mode or "simple"
+        start = time.perf_counter()
+        if args.search:
+            found = search_positions(size, mode, SEARCH_PLIES if args.plies is None else args.plies, args.time_limit)
+        else:
+            found = solve_positions(size, mode, args.plies)
+        entries.update(found)
+        print(f"{size}x{size} {mode}: {len(found)} positions in {time.perf_counter() - start:.1f}s")
+    write_book(args.output, entries)
+    print(f"Wrote {len(entries)} positions to {args.output}")
+    return 0
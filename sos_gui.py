@@ -1,8 +1,18 @@
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import messagebox
+import queue
 import random
 import math
+import os
+import threading
+import time
+import SosGame
+import sos_metrics
 from SosGame import SimpleGame, GeneralGame, HumanPlayer, ComputerPlayer
+from sos_llm import LLMMoveCache
+from sos_records import GameRecord, GameRecordReader, GameRecordWriter
+from sos_replay import Replay
 
 #Theme configuration
 THEME = {
@@ -19,6 +29,44 @@ THEME = {
     "font_piece": ("Arial", 12, "bold")
 }
 
+# How long an AI may think before the GUI plays a quick heuristic move for it
+AI_MOVE_DEADLINE_MS = 8000
+AI_POLL_MS = 50
+
+# Window resizes are applied once they have settled for this long
+RESIZE_DEBOUNCE_MS = 150
+
+# Hover updates are coalesced to at most one per display frame
+FRAME_MS = 16
+
+# Win animation: one frame per CHAOS_FRAME_MS, effects are skipped for a frame that starts
+# more than CHAOS_FRAME_BUDGET_MS late, and the pools below cap how many items it owns.
+# SOS_ANIMATIONS=0 starts the GUI with the animation switched off.
+CHAOS_FRAME_MS = 100
+CHAOS_FRAME_BUDGET_MS = 50
+CHAOS_MAX_TEXTS = 8
+CHAOS_MAX_DOTS = 40
+CHAOS_PHRASES = ["MOM GET THE CAMERA", "EZ GAME", "OH BABY A TRIPLE!", "SAMPLE TEXT", "SOS CONFIRMED", "NO SCOPE", "REKT", "GG"]
+CHAOS_COLORS = ["#FF0000", "#00FF00", "#0000FF", "#FFFF00", "#00FFFF", "#FF00FF"]
+
+# The board canvas is a viewport onto the whole board: cells never get smaller than
+# MIN_CELL_PX (bigger boards scroll instead), zoom multiplies the fitted cell size, and
+# only the pieces inside the view have canvas items. The minimap is MINIMAP_PX square.
+MIN_CELL_PX = 24
+MAX_CELL_PX = 200
+ZOOM_STEP = 1.25
+MINIMAP_PX = 150
+MINIMAP_COLORS = {'': THEME["board_bg"], 'S': "#000000", 'O': "#808080"}
+
+# How often the metrics overlay refreshes while it is shown
+METRICS_REFRESH_MS = 500
+
+# Recorded games are appended here (with a .idx sidecar); Replay plays back the last one
+GAME_RECORD_FILE = "game_records.sosrec"
+
+# Replay speeds as milliseconds between moves; "instant" jumps straight to the end
+REPLAY_SPEEDS = {"slow": 1000, "normal": 500, "fast": 150, "instant": 0}
+
 class SOSGUI:
     # Sets up the window and all the buttons
     def __init__(self, root):
@@ -32,11 +80,50 @@ class SOSGUI:
         self.board_size = 3
         self.is_processing_move = False
         self.is_replaying = False
-        self.replay_moves = []
-        
-        # Animation control
+
+        # Background AI moves: results come back through a queue tagged with the
+        # token they were asked under, so anything from an abandoned move is dropped
+        self.ai_results = queue.Queue()
+        self.ai_token = 0
+        # set when the move being computed is abandoned, so the player stops thinking
+        self.ai_cancel = None
+        self.ai_deadline = 0.0
+
+        # Claude answers are remembered across games (only when a key is set up)
+        self.llm_cache = LLMMoveCache("llm_move_cache.db") if "sk-ant" in SosGame.CLAUDE_API_KEY else None
+        # Replay playback: the seekable model, and the pending after() for autoplay
+        self.replay = None
+        self.replay_after = None
+        self.replay_playing = False
+
+        # Canvas item for each drawn piece in view, so single cells can be cleared; items
+        # for cells scrolled out of view are hidden and kept in spare_items for reuse. The
+        # grid is only rebuilt when the board size changes and is rescaled in place otherwise
+        self.piece_items = {}
+        self.spare_items = []
+        self.grid_size = None
+        self.resize_after = None
+        self.view_after = None
+        self.zoom = 1.0
+        # every piece shares this font, so resizing them all is one configure()
+        self.piece_font = tkfont.Font(root=root, family="Arial", size=60, weight="bold")
+
+        # One hover rectangle for the whole session: moved with coords, hidden when unused
+        self.highlight_item = None
+        self.highlight_cell = None
+        self.hover_pos = None
+        self.hover_after = None
+
+        # Animation control: recycled item pools and the pending frame
         self.animation_running = False
-        self.animation_objects = []
+        self.chaos_after = None
+        self.chaos_due = 0.0
+        self.chaos_texts = []
+        self.chaos_dots = []
+        self.chaos_next_text = 0
+        self.chaos_next_dot = 0
+        self.winner_item = None
+        self.winner_font = tkfont.Font(root=root, family="Impact", size=40)
 
         # Options Frame
         self.options_frame = tk.Frame(root, bg=THEME["bg_panel"], bd=2, relief="raised")
@@ -84,11 +171,31 @@ class SOSGUI:
         self.red_score_label = tk.Label(self.red_player_frame, text="Score: 0", fg=THEME["red_player"], font=("Arial", 12, "bold"), bg="white")
         self.red_score_label.pack(pady=5)
 
-        # Canvas 
-        self.canvas = tk.Canvas(root, width=self.canvas_size, height=self.canvas_size, bg=THEME["board_bg"], highlightthickness=0)
-        self.canvas.pack(pady=10)
+        # Canvas viewport with scrollbars and a minimap (the last two only for boards that don't fit)
+        self.board_frame = tk.Frame(root, bg=THEME["bg_main"])
+        self.board_frame.pack(pady=10)
+        self.canvas = tk.Canvas(self.board_frame, width=self.canvas_size, height=self.canvas_size, bg=THEME["board_bg"], highlightthickness=0,
+                                xscrollcommand=self.on_xview, yscrollcommand=self.on_yview)
+        self.canvas.grid(row=0, column=0)
+        self.hscroll = tk.Scrollbar(self.board_frame, orient=tk.HORIZONTAL, command=self.canvas.xview)
+        self.vscroll = tk.Scrollbar(self.board_frame, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.minimap = tk.Canvas(self.board_frame, width=MINIMAP_PX, height=MINIMAP_PX, bg=THEME["board_bg"], highlightthickness=1)
+        self.minimap_image = tk.PhotoImage(width=MINIMAP_PX, height=MINIMAP_PX)
+        self.minimap.create_image(0, 0, image=self.minimap_image, anchor=tk.NW)
+        self.minimap_view = self.minimap.create_rectangle(0, 0, 0, 0, outline=THEME["red_player"], width=2)
+        self.metrics_label = tk.Label(self.board_frame, text="", justify=tk.LEFT, anchor=tk.NW, bg="#000000", fg="#FFFFFF", font=("Courier", 9))
+        self.minimap.bind("<Button-1>", self.on_minimap_click)
+        self.minimap.bind("<B1-Motion>", self.on_minimap_click)
         self.canvas.bind("<Button-1>", self.on_canvas_click)
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self.on_mouse_wheel)
         self.canvas.bind("<Motion>", self.on_mouse_move)
+        self.canvas.bind("<Leave>", self.on_mouse_leave)
+        self.root.bind("<Configure>", self.on_configure)
+        self.root.bind("<Control-plus>", lambda event: self.set_zoom(self.zoom * ZOOM_STEP))
+        self.root.bind("<Control-equal>", lambda event: self.set_zoom(self.zoom * ZOOM_STEP))
+        self.root.bind("<Control-minus>", lambda event: self.set_zoom(self.zoom / ZOOM_STEP))
 
         # Bottom Frame
         self.bottom_frame = tk.Frame(root, bg=THEME["bg_panel"], bd=2, relief="raised")
@@ -101,18 +208,45 @@ class SOSGUI:
         self.record_cb = tk.Checkbutton(self.bottom_frame, text="Record", variable=self.record_game_var, bg=THEME["bg_panel"], font=THEME["font_main"])
         self.record_cb.pack(side=tk.LEFT, padx=10)
 
+        self.show_hints_var = tk.IntVar()
+        self.hints_cb = tk.Checkbutton(self.bottom_frame, text="Hints", variable=self.show_hints_var, command=self.draw_hints, bg=THEME["bg_panel"], font=THEME["font_main"])
+        self.hints_cb.pack(side=tk.LEFT, padx=10)
+
+        self.animations_var = tk.IntVar(value=int(os.environ.get("SOS_ANIMATIONS", "1") != "0"))
+        self.animations_cb = tk.Checkbutton(self.bottom_frame, text="Celebrate", variable=self.animations_var, command=self.on_animations_toggle, bg=THEME["bg_panel"], font=THEME["font_main"])
+        self.animations_cb.pack(side=tk.LEFT, padx=10)
+
+        self.metrics_var = tk.IntVar()
+        self.metrics_cb = tk.Checkbutton(self.bottom_frame, text="Stats", variable=self.metrics_var, command=self.on_metrics_toggle, bg=THEME["bg_panel"], font=THEME["font_main"])
+        self.metrics_cb.pack(side=tk.LEFT, padx=10)
+        self.metrics_after = None
+
         self.replay_button = tk.Button(self.bottom_frame, text="Replay", command=self.start_replay, bg="black", fg="black", font=THEME["font_main"])
         self.replay_button.pack(side=tk.LEFT, padx=10)
 
         self.new_game_button = tk.Button(self.bottom_frame, text="Reset", command=self.start_new_game_manual, bg=THEME["red_player"], fg="black", font=THEME["font_main"])
         self.new_game_button.pack(side=tk.RIGHT, padx=10, pady=5)
 
+        # Replay controls (only shown while a replay is loaded)
+        self.replay_frame = tk.Frame(root, bg=THEME["bg_panel"], bd=2, relief="raised")
+        tk.Button(self.replay_frame, text="|<", command=lambda: self.seek_replay(0), font=THEME["font_main"]).pack(side=tk.LEFT, padx=2)
+        tk.Button(self.replay_frame, text="<", command=lambda: self.seek_replay(self.replay.position - 1), font=THEME["font_main"]).pack(side=tk.LEFT, padx=2)
+        self.replay_play_button = tk.Button(self.replay_frame, text="Play", width=5, command=self.toggle_replay_playback, font=THEME["font_main"])
+        self.replay_play_button.pack(side=tk.LEFT, padx=2)
+        tk.Button(self.replay_frame, text=">", command=lambda: self.seek_replay(self.replay.position + 1), font=THEME["font_main"]).pack(side=tk.LEFT, padx=2)
+        tk.Button(self.replay_frame, text=">|", command=lambda: self.seek_replay(len(self.replay)), font=THEME["font_main"]).pack(side=tk.LEFT, padx=2)
+        self.replay_scale = tk.Scale(self.replay_frame, from_=0, to=0, orient=tk.HORIZONTAL, showvalue=True, length=200,
+                                     command=lambda v: self.seek_replay(int(v)), bg=THEME["bg_panel"])
+        self.replay_scale.pack(side=tk.LEFT, padx=10, fill="x", expand=True)
+        self.replay_speed_var = tk.StringVar(value="normal")
+        tk.OptionMenu(self.replay_frame, self.replay_speed_var, *REPLAY_SPEEDS).pack(side=tk.LEFT, padx=5)
+
         self.start_new_game()
 
     # Starts a game when the button is clicked
     def start_new_game_manual(self):
         self.stop_mlg_chaos()
-        self.is_replaying = False
+        self.stop_replay()
         self.start_new_game()
 
     # Restarts the game if the mode changes
@@ -127,27 +261,51 @@ class SOSGUI:
             self.stop_mlg_chaos()
             self.start_new_game()
 
-    # Highlights the box under the mouse
+    # Remembers where the mouse is; the highlight catches up at most once a frame
     def on_mouse_move(self, event):
-        if self.game is None or self.game.game_over or self.is_replaying:
+        self.hover_pos = (self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if self.hover_after is None:
+            self.hover_after = self.root.after(FRAME_MS, self.update_highlight)
+
+    def on_mouse_leave(self, event):
+        self.hover_pos = None
+        self.hide_highlight()
+
+    # Highlights the box under the mouse
+    def update_highlight(self):
+        self.hover_after = None
+        if self.game is None or self.game.game_over or self.is_replaying or self.hover_pos is None:
+            self.hide_highlight()
             return
-            
+
         current_player = self.game.get_current_player()
         if not isinstance(current_player, HumanPlayer):
+            self.hide_highlight()
             return
 
-        col = int(event.x // self.cell_size)
-        row = int(event.y // self.cell_size)
-
-        self.canvas.delete("highlight")
+        x, y = self.hover_pos
+        col = int(x // self.cell_size)
+        row = int(y // self.cell_size)
+        if not self.game.is_free(row, col):
+            self.hide_highlight()
+            return
+        if self.highlight_cell == (row, col):
+            return
 
-        if 0 <= row < self.board_size and 0 <= col < self.board_size:
-            x1 = col * self.cell_size
-            y1 = row * self.cell_size
-            x2 = x1 + self.cell_size
-            y2 = y1 + self.cell_size
-            self.canvas.create_rectangle(x1, y1, x2, y2, fill=THEME["highlight"], outline="", tags="highlight")
-            self.canvas.tag_lower("highlight")
+        x1 = col * self.cell_size
+        y1 = row * self.cell_size
+        if self.highlight_item is None:
+            self.highlight_item = self.canvas.create_rectangle(0, 0, 0, 0, fill=THEME["highlight"], outline="", tags="highlight")
+        self.canvas.coords(self.highlight_item, x1, y1, x1 + self.cell_size, y1 + self.cell_size)
+        if self.highlight_cell is None:
+            self.canvas.itemconfigure(self.highlight_item, state="normal")
+            self.canvas.tag_lower(self.highlight_item)
+        self.highlight_cell = (row, col)
+
+    def hide_highlight(self):
+        if self.highlight_cell is not None:
+            self.canvas.itemconfigure(self.highlight_item, state="hidden")
+            self.highlight_cell = None
 
     # Handles what happens when you click the board
     def on_canvas_click(self, event):
@@ -156,17 +314,20 @@ class SOSGUI:
 
         current_player = self.game.get_current_player()
         if isinstance(current_player, HumanPlayer):
-            col = int(event.x // self.cell_size)
-            row = int(event.y // self.cell_size)
+            col = int(self.canvas.canvasx(event.x) // self.cell_size)
+            row = int(self.canvas.canvasy(event.y) // self.cell_size)
             
+            if not self.game.is_free(row, col):
+                return
+
             piece = self.blue_piece_var.get() if self.game.current_turn_is_blue else self.red_piece_var.get()
             
             soses_found, move_made = self.game.make_move(row, col, piece)
 
             if move_made:
                 self.handle_move_result(row, col, piece, soses_found)
+                self.hide_highlight()
                 self.handle_turn()
-                self.canvas.delete("highlight")
 
     # Updates the board after a move is made
     def handle_move_result(self, row, col, piece, soses_found):
@@ -177,9 +338,10 @@ class SOSGUI:
             self.draw_sos_lines(soses_found, color)
         
         self.update_game_status()
+        self.draw_hints()
         self.check_for_game_over()
         
-    # Logic for the computer to take its turn
+    # Logic for the computer to take its turn: think on a worker thread, poll from Tk
     def handle_computer_move(self):
         if self.game.game_over:
             return
@@ -187,18 +349,71 @@ class SOSGUI:
         current_player = self.game.get_current_player()
         if isinstance(current_player, ComputerPlayer):
             self.is_processing_move = True
-            
-            r, c, piece = current_player.get_move(self.game)
-            
-            if r is not None:
-                soses_found, move_made = self.game.make_move(r, c, piece)
-                if move_made:
-                    self.handle_move_result(r, c, piece, soses_found)
-                    self.root.after(500, self.handle_turn)
-                else:
-                    self.is_processing_move = False
-            else:
-                self.is_processing_move = False
+            self.ai_token += 1
+            token = self.ai_token
+            snapshot = self.game.copy()
+            # the move is still this game's, even though it is worked out on a copy
+            snapshot.game_id = self.game.game_id
+            self.ai_deadline = time.monotonic() + AI_MOVE_DEADLINE_MS / 1000
+            cancel = self.ai_cancel = threading.Event()
+
+            def think():
+                try:
+                    move = current_player.get_move(snapshot, cancel)
+                except Exception as e:
+                    print(f"AI error: {e}")
+                    move = (None, None, None)
+                self.ai_results.put((token, move))
+
+            threading.Thread(target=think, daemon=True).start()
+            self.root.after(AI_POLL_MS, self.poll_computer_move, token)
+
+    # Picks up the worker's answer on the Tk thread, or gives up at the deadline
+    def poll_computer_move(self, token):
+        if token != self.ai_token:
+            return
+
+        move = None
+        while move is None:
+            try:
+                result_token, result = self.ai_results.get_nowait()
+            except queue.Empty:
+                break
+            if result_token == token:
+                move = result
+
+        if move is None:
+            if time.monotonic() < self.ai_deadline:
+                self.root.after(AI_POLL_MS, self.poll_computer_move, token)
+                return
+            print("AI took too long. Playing a quick move instead.")
+            self.ai_cancel.set()
+            self.ai_token += 1
+            move = self.game.get_current_player().heuristic_move(self.game)
+
+        r, c, piece = move
+        # a worker that failed leaves no move; play one anyway so the game doesn't stall on its turn
+        if r is None and not self.game.game_over:
+            print("AI gave no move. Playing a quick move instead.")
+            r, c, piece = self.game.get_current_player().heuristic_move(self.game)
+        if r is not None:
+            soses_found, move_made = self.game.make_move(r, c, piece)
+            if move_made:
+                self.handle_move_result(r, c, piece, soses_found)
+                self.root.after(500, self.handle_turn_if_current, self.ai_token)
+                return
+        self.is_processing_move = False
+
+    # Abandons any move the AI is still working on: it is told to stop and its answer is ignored
+    def cancel_computer_move(self):
+        if self.ai_cancel is not None:
+            self.ai_cancel.set()
+        self.ai_token += 1
+        self.is_processing_move = False
+
+    def handle_turn_if_current(self, token):
+        if token == self.ai_token:
+            self.handle_turn()
 
     # Decides whose turn it is
     def handle_turn(self):
@@ -209,55 +424,253 @@ class SOSGUI:
         current_player = self.game.get_current_player()
         
         if isinstance(current_player, ComputerPlayer):
+            self.hide_highlight()
             self.handle_computer_move()
         else:
             self.is_processing_move = False
             
-    # Draws the S or O on the screen
-    def draw_piece(self, row, col, piece):
+    # Draws the S or O on the screen (and the minimap); cells out of view get no item
+    def draw_piece(self, row, col, piece, minimap=True):
+        if minimap:
+            self.mark_minimap(row, col, piece)
+        if not self.cell_in_view(row, col):
+            return
         x = col * self.cell_size + self.cell_size / 2
         y = row * self.cell_size + self.cell_size / 2
-        self.canvas.create_text(x, y, text=piece.upper(), fill="black", font=("Arial", int(self.cell_size * 0.6), "bold"))
+        item = self.piece_items.get((row, col))
+        if item is None:
+            item = self.spare_items.pop() if self.spare_items else None
+        if item is None:
+            item = self.canvas.create_text(x, y, text=piece.upper(), fill="black", font=self.piece_font, tags="piece")
+        else:
+            self.canvas.coords(item, x, y)
+            self.canvas.itemconfigure(item, text=piece.upper(), state="normal")
+        self.piece_items[row, col] = item
+
+    # Removes the piece drawn on one cell, if any
+    def clear_piece(self, row, col, minimap=True):
+        if minimap:
+            self.mark_minimap(row, col, '')
+        item = self.piece_items.pop((row, col), None)
+        if item is not None:
+            self.canvas.itemconfigure(item, state="hidden")
+            self.spare_items.append(item)
+
+    # First and last visible (row, col), clamped to the board
+    def view_cells(self):
+        x0, y0, x1, y1 = self.view_box()
+        last = self.board_size - 1
+        return (max(0, int(y0 // self.cell_size)), max(0, int(x0 // self.cell_size)),
+                min(last, int((y1 - 1) // self.cell_size)), min(last, int((x1 - 1) // self.cell_size)))
+
+    def cell_in_view(self, row, col):
+        r0, c0, r1, c1 = self.view_cells()
+        return r0 <= row <= r1 and c0 <= col <= c1
+
+    # The part of the board canvas on screen, in board coordinates
+    def view_box(self):
+        x0 = self.canvas.canvasx(0)
+        y0 = self.canvas.canvasy(0)
+        return x0, y0, x0 + self.canvas_size, y0 + self.canvas_size
+
+    # Brings the piece items in line with the view: hides what scrolled out, draws what came in
+    def refresh_viewport(self):
+        self.view_after = None
+        if self.game is None:
+            return
+        r0, c0, r1, c1 = self.view_cells()
+        for (r, c) in list(self.piece_items):
+            if not (r0 <= r <= r1 and c0 <= c <= c1):
+                self.clear_piece(r, c, minimap=False)
+        cell = self.game.cell
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                piece = cell(r, c)
+                if piece and (r, c) not in self.piece_items:
+                    self.draw_piece(r, c, piece, minimap=False)
+        self.update_minimap_view()
+
+    # Scrolling fires many view changes; the items catch up once things are idle
+    def schedule_viewport_refresh(self):
+        if self.view_after is None:
+            self.view_after = self.root.after_idle(self.refresh_viewport)
+
+    def on_xview(self, first, last):
+        self.hscroll.set(first, last)
+        self.schedule_viewport_refresh()
+
+    def on_yview(self, first, last):
+        self.vscroll.set(first, last)
+        self.schedule_viewport_refresh()
+
+    # Wheel scrolls, Shift+wheel scrolls sideways, Ctrl+wheel zooms around the pointer
+    def on_mouse_wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        if event.state & 0x4:
+            self.set_zoom(self.zoom * (ZOOM_STEP if up else 1 / ZOOM_STEP), event.x, event.y)
+        elif event.state & 0x1:
+            self.canvas.xview_scroll(-1 if up else 1, "units")
+        else:
+            self.canvas.yview_scroll(-1 if up else 1, "units")
+
+    # Changes the zoom, keeping the board point under (px, py) where it is on screen
+    def set_zoom(self, zoom, px=None, py=None):
+        if px is None:
+            px = py = self.canvas_size / 2
+        wx, wy = self.canvas.canvasx(px), self.canvas.canvasy(py)
+        old_cell = self.cell_size
+        self.zoom = zoom
+        self.rescale_canvas(self.canvas_size)
+        factor = self.cell_size / old_cell
+        world = self.cell_size * self.board_size
+        self.canvas.xview_moveto((wx * factor - px) / world)
+        self.canvas.yview_moveto((wy * factor - py) / world)
+
+    # Nearest-neighbour downsample of the whole board into the minimap image
+    def draw_minimap(self):
+        n = self.board_size
+        cell = self.game.cell if self.game else None
+        cols = [px * n // MINIMAP_PX for px in range(MINIMAP_PX)]
+        rows = []
+        for py in range(MINIMAP_PX):
+            r = py * n // MINIMAP_PX
+            rows.append("{" + " ".join(MINIMAP_COLORS[cell(r, c) if cell else ''] for c in cols) + "}")
+        self.minimap_image.put(" ".join(rows), to=(0, 0))
+        self.update_minimap_view()
+
+    # Paints the minimap block covering one cell
+    def mark_minimap(self, row, col, piece):
+        n = self.board_size
+        x0, y0 = col * MINIMAP_PX // n, row * MINIMAP_PX // n
+        x1 = max(x0 + 1, (col + 1) * MINIMAP_PX // n)
+        y1 = max(y0 + 1, (row + 1) * MINIMAP_PX // n)
+        self.minimap_image.put(MINIMAP_COLORS[piece], to=(x0, y0, x1, y1))
+
+    def update_minimap_view(self):
+        x0, x1 = self.canvas.xview()
+        y0, y1 = self.canvas.yview()
+        self.minimap.coords(self.minimap_view, x0 * MINIMAP_PX, y0 * MINIMAP_PX, x1 * MINIMAP_PX, y1 * MINIMAP_PX)
+
+    # Centres the view on the clicked spot of the minimap
+    def on_minimap_click(self, event):
+        x0, x1 = self.canvas.xview()
+        y0, y1 = self.canvas.yview()
+        self.canvas.xview_moveto(event.x / MINIMAP_PX - (x1 - x0) / 2)
+        self.canvas.yview_moveto(event.y / MINIMAP_PX - (y1 - y0) / 2)
+
+    # Marks the cells that would score right now (read straight off the game's threat map)
+    def draw_hints(self):
+        self.canvas.delete("hint")
+        if not self.show_hints_var.get() or self.game is None or self.game.game_over or self.is_replaying:
+            return
+        if not isinstance(self.game.get_current_player(), HumanPlayer):
+            return
+        r0, c0, r1, c1 = self.view_cells()
+        for r, c, piece, points in self.game.scoring_moves():
+            if not (r0 <= r <= r1 and c0 <= c <= c1):
+                continue
+            dx = self.cell_size * (0.2 if piece == 'S' else 0.8)
+            x = c * self.cell_size + dx
+            y = r * self.cell_size + self.cell_size * 0.2
+            label = piece if points == 1 else f"{piece}x{points}"
+            self.canvas.create_text(x, y, text=label, fill=THEME["highlight"], font=THEME["font_main"], tags="hint")
 
     # Draws the line when a point is scored
-    def draw_sos_lines(self, soses, color):
+    def draw_sos_lines(self, soses, color, tags=()):
+        if isinstance(tags, str):
+            tags = (tags,)
         for (r1, c1), (r2, c2) in soses:
             x1 = c1 * self.cell_size + self.cell_size / 2
             y1 = r1 * self.cell_size + self.cell_size / 2
             x2 = c2 * self.cell_size + self.cell_size / 2
             y2 = r2 * self.cell_size + self.cell_size / 2
-            self.canvas.create_line(x1, y1, x2, y2, fill=color, width=5, capstyle=tk.ROUND)
+            self.canvas.create_line(x1, y1, x2, y2, fill=color, width=5, capstyle=tk.ROUND, tags=("sos_line", *tags))
 
-    # Draws the grid lines
-    def draw_board(self):
-        self.canvas.delete("all")
+    # How big the canvas should be for the current window and board size
+    def fit_canvas_size(self):
         desired_size = self.board_size * 80
         available_height = self.root.winfo_height() - 250
         available_width = self.root.winfo_width() - 50
-        
+
         if available_height < 100: available_height = 800
         if available_width < 100: available_width = 800
-        
-        self.canvas_size = max(min(available_height, available_width, desired_size), 300)
-        self.cell_size = self.canvas_size / self.board_size
-        self.canvas.config(width=self.canvas_size, height=self.canvas_size)
 
-        for i in range(1, self.board_size):
-            self.canvas.create_line(i * self.cell_size, 0, i * self.cell_size, self.canvas_size, width=2, fill=THEME["grid_color"])
-            self.canvas.create_line(0, i * self.cell_size, self.canvas_size, i * self.cell_size, width=2, fill=THEME["grid_color"])
-        
-        if self.game:
-            for r in range(self.board_size):
-                for c in range(self.board_size):
-                    piece = self.game.board[r][c]
-                    if piece:
-                        self.draw_piece(r, c, piece)
+        return max(min(available_height, available_width, desired_size), 300)
+
+    # Sets the viewport size, cell size, scroll region and piece font; existing items are left alone
+    def set_canvas_size(self, size):
+        self.canvas_size = size
+        fitted = max(size / self.board_size, MIN_CELL_PX)
+        self.cell_size = min(max(fitted * self.zoom, MIN_CELL_PX), MAX_CELL_PX)
+        self.zoom = self.cell_size / fitted
+        world = self.cell_size * self.board_size
+        self.canvas.config(width=size, height=size, scrollregion=(0, 0, world, world))
+        self.piece_font.configure(size=max(1, int(self.cell_size * 0.6)))
+
+        # scrollbars and minimap only when the board is bigger than the view
+        if world > size + 0.5:
+            self.hscroll.grid(row=1, column=0, sticky="ew")
+            self.vscroll.grid(row=0, column=1, sticky="ns")
+            self.minimap.grid(row=0, column=2, sticky="n", padx=(10, 0))
+        else:
+            self.hscroll.grid_remove()
+            self.vscroll.grid_remove()
+            self.minimap.grid_remove()
+
+    # Clears the pieces and marks of the last game; the grid is kept unless the size changed
+    def draw_board(self):
+        self.canvas.delete("sos_line", "hint")
+        self.canvas.itemconfigure("piece", state="hidden")
+        self.hide_highlight()
+        self.spare_items.extend(self.piece_items.values())
+        self.piece_items = {}
+        size = self.fit_canvas_size()
+
+        if self.grid_size != self.board_size:
+            self.canvas.delete("grid")
+            self.zoom = 1.0
+            self.set_canvas_size(size)
+            world = self.cell_size * self.board_size
+            for i in range(1, self.board_size):
+                self.canvas.create_line(i * self.cell_size, 0, i * self.cell_size, world, width=2, fill=THEME["grid_color"], tags="grid")
+                self.canvas.create_line(0, i * self.cell_size, world, i * self.cell_size, width=2, fill=THEME["grid_color"], tags="grid")
+            self.canvas.tag_lower("grid")
+            self.canvas.xview_moveto(0)
+            self.canvas.yview_moveto(0)
+            self.grid_size = self.board_size
+        elif size != self.canvas_size:
+            self.rescale_canvas(size)
+
+        self.draw_minimap()
+        self.refresh_viewport()
+
+    # Stretches every existing item to a new view size or zoom instead of redrawing
+    def rescale_canvas(self, size):
+        old_cell = self.cell_size
+        self.set_canvas_size(size)
+        factor = self.cell_size / old_cell
+        if factor != 1:
+            self.canvas.scale("all", 0, 0, factor, factor)
+        self.schedule_viewport_refresh()
+
+    # Window resizes arrive in bursts; only the last one is acted on
+    def on_configure(self, event):
+        if event.widget is not self.root:
+            return
+        if self.resize_after is not None:
+            self.root.after_cancel(self.resize_after)
+        self.resize_after = self.root.after(RESIZE_DEBOUNCE_MS, self.apply_resize)
+
+    def apply_resize(self):
+        self.resize_after = None
+        if self.grid_size is None:
+            return
+        size = self.fit_canvas_size()
+        if size != self.canvas_size:
+            self.rescale_canvas(size)
 
     # Resets everything and starts a fresh game
     def start_new_game(self):
-        if self.is_processing_move:
-            return
-            
         self.stop_mlg_chaos()
 
         try:
@@ -271,7 +684,9 @@ class SOSGUI:
             messagebox.showerror("Invalid Size", "Please enter a valid number for board size.")
             self.board_size_var.set(str(self.board_size))
             return
-        
+        # only once the new game is certain, so a bad size leaves the current one playing
+        self.cancel_computer_move()
+
         blue_type = self.blue_player_type_var.get()
         red_type = self.red_player_type_var.get()
         blue_piece_choice = self.blue_piece_var.get()
@@ -280,21 +695,22 @@ class SOSGUI:
         if blue_type == "human":
             blue_player = HumanPlayer("Blue", blue_piece_choice)
         else:
-            blue_player = ComputerPlayer("Blue", blue_piece_choice)
+            blue_player = ComputerPlayer("Blue", blue_piece_choice, think_delay=0.5, move_cache=self.llm_cache)
 
         if red_type == "human":
             red_player = HumanPlayer("Red", red_piece_choice)
         else:
-            red_player = ComputerPlayer("Red", red_piece_choice)
+            red_player = ComputerPlayer("Red", red_piece_choice, think_delay=0.5, move_cache=self.llm_cache)
         
         mode = self.game_mode_var.get()
         if mode == "simple":
-            self.game = SimpleGame(self.board_size, blue_player, red_player)
+            self.game = SimpleGame(self.board_size, blue_player, red_player, track_threats=True)
         else:
-            self.game = GeneralGame(self.board_size, blue_player, red_player)
+            self.game = GeneralGame(self.board_size, blue_player, red_player, track_threats=True)
             
         self.draw_board()
         self.update_game_status()
+        self.draw_hints()
         
         if not self.is_replaying:
             self.handle_turn()
@@ -328,128 +744,219 @@ class SOSGUI:
             self.is_processing_move = False
             self.is_replaying = False
 
-    # Saves the move history to a text file
+    # Appends the finished game to the shared binary game record file
     def save_game_to_file(self):
         try:
-            with open("game_record.txt", "w") as f:
-                mode = self.game_mode_var.get()
-                blue_type = self.blue_player_type_var.get()
-                red_type = self.red_player_type_var.get()
-                f.write(f"{self.board_size}\n")
-                f.write(f"{mode}\n")
-                f.write(f"{blue_type}\n")
-                f.write(f"{red_type}\n")
-                
-                for move in self.game.history:
-                    f.write(f"{move[0]},{move[1]},{move[2]}\n")
-            print("Game recorded to game_record.txt")
+            record = GameRecord.from_game(self.game, self.blue_player_type_var.get(), self.red_player_type_var.get())
+            with GameRecordWriter(GAME_RECORD_FILE) as writer:
+                writer.append(record)
+            print(f"Game recorded to {GAME_RECORD_FILE}")
         except Exception as e:
             print(f"Error saving game: {e}")
 
-    # Reads the file and starts the replay mode
+    # Loads the most recent recorded game and starts the replay mode
     def start_replay(self):
         self.stop_mlg_chaos()
+        self.stop_replay()
         try:
-            with open("game_record.txt", "r") as f:
-                lines = f.readlines()
-            
-            if not lines:
-                messagebox.showerror("Error", "Game record is empty.")
-                return
+            with GameRecordReader(GAME_RECORD_FILE) as reader:
+                if not len(reader):
+                    messagebox.showerror("Error", "Game record is empty.")
+                    return
+                record = reader[-1]
 
             self.is_replaying = True
-            
-            size = int(lines[0].strip())
-            mode = lines[1].strip()
-            blue_type = lines[2].strip()
-            red_type = lines[3].strip()
-            
-            self.board_size_var.set(str(size))
-            self.game_mode_var.set(mode)
-            self.blue_player_type_var.set(blue_type)
-            self.red_player_type_var.set(red_type)
-            
+
+            self.board_size_var.set(str(record.size))
+            self.game_mode_var.set(record.mode)
+            self.blue_player_type_var.set("human" if record.blue_type == "human" else "computer")
+            self.red_player_type_var.set("human" if record.red_type == "human" else "computer")
+
             self.start_new_game()
-            
-            self.replay_moves = []
-            for line in lines[4:]:
-                parts = line.strip().split(',')
-                if len(parts) == 3:
-                    self.replay_moves.append((int(parts[0]), int(parts[1]), parts[2]))
-            
-            self.process_next_replay_move()
-            
+
+            self.replay = Replay(record)
+            self.game = self.replay.game
+            self.replay_scale.config(to=len(self.replay))
+            self.replay_scale.set(0)
+            self.replay_frame.pack(pady=(0, 10), fill="x", padx=10)
+            self.update_game_status()
+            self.toggle_replay_playback()
+
         except FileNotFoundError:
-            messagebox.showerror("Error", "No recorded game found (game_record.txt).")
+            messagebox.showerror("Error", f"No recorded game found ({GAME_RECORD_FILE}).")
         except Exception as e:
-            self.is_replaying = False
+            self.stop_replay()
             messagebox.showerror("Error", f"Error reading replay file: {e}")
 
-    # Plays the next move in the replay list
-    def process_next_replay_move(self):
-        if not self.is_replaying or not self.replay_moves:
+    # Leaves replay mode and hides its controls
+    def stop_replay(self):
+        self.pause_replay()
+        self.replay = None
+        self.is_replaying = False
+        self.replay_frame.pack_forget()
+
+    # Jumps the replay to move k and redraws only the cells (and SOS lines) that changed
+    def seek_replay(self, k):
+        if self.replay is None:
             return
+        for i, r, c, piece in self.replay.seek(k):
+            if piece:
+                self.draw_piece(r, c, piece)
+                soses, blue = self.replay.lines(i)
+                if soses:
+                    color = THEME["blue_player"] if blue else THEME["red_player"]
+                    self.draw_sos_lines(soses, color, tags=f"replay_move_{i}")
+            else:
+                self.clear_piece(r, c)
+                self.canvas.delete(f"replay_move_{i}")
+        self.game = self.replay.game
+        self.replay_scale.set(self.replay.position)
+        self.update_game_status()
+        if self.replay.at_end():
+            self.pause_replay()
+            winner = self.game.winner
+            self.turn_label.config(text=f"Replay: {winner} wins" if winner else "Replay: draw", fg=THEME["fg_text"])
 
-        r, c, piece = self.replay_moves.pop(0)
-        soses_found, move_made = self.game.make_move(r, c, piece)
-        self.handle_move_result(r, c, piece, soses_found)
-        
-        if self.replay_moves and not self.game.game_over:
-            self.root.after(1000, self.process_next_replay_move)
+    def toggle_replay_playback(self):
+        if self.replay_playing:
+            self.pause_replay()
+            return
+        if self.replay.at_end():
+            self.seek_replay(0)
+        self.replay_playing = True
+        self.replay_play_button.config(text="Pause")
+        self.process_next_replay_move()
+
+    def pause_replay(self):
+        self.replay_playing = False
+        if self.replay_after is not None:
+            self.root.after_cancel(self.replay_after)
+            self.replay_after = None
+        self.replay_play_button.config(text="Play")
+
+    # Autoplay: advances one move per tick at the chosen speed, or all the way when instant
+    def process_next_replay_move(self):
+        self.replay_after = None
+        if not self.replay_playing or self.replay is None:
+            return
+        delay = REPLAY_SPEEDS[self.replay_speed_var.get()]
+        self.seek_replay(len(self.replay) if delay == 0 else self.replay.position + 1)
+        if self.replay_playing:
+            self.replay_after = self.root.after(delay, self.process_next_replay_move)
 
-    
-    # Makes the screen go crazy when someone wins
+    # Makes the screen go crazy when someone wins (or just says who won, with it switched off)
     def trigger_mlg_chaos(self, winner):
-        self.animation_running = True
-        self.animation_objects = []
-        
+        self.stop_mlg_chaos()
         win_text = f"{winner} WINS!" if winner else "DRAW!"
-        mlg_phrases = ["MOM GET THE CAMERA", "EZ GAME", "OH BABY A TRIPLE!", "SAMPLE TEXT", "SOS CONFIRMED", "NO SCOPE", "REKT", "GG"]
-        colors = ["#FF0000", "#00FF00", "#0000FF", "#FFFF00", "#00FFFF", "#FF00FF"]
-        
-        def animate_frame():
-            if not self.animation_running:
-                return
+        if not self.animations_var.get():
+            self.turn_label.config(text=win_text, fg=THEME["fg_text"])
+            return
+
+        self.animation_running = True
+        if self.winner_item is None:
+            self.winner_item = self.canvas.create_text(0, 0, font=self.winner_font, fill="white", tags="winner_text")
+        self.canvas.itemconfigure(self.winner_item, text=win_text, state="normal")
+        x0, y0, x1, y1 = self.view_box()
+        self.canvas.coords(self.winner_item, (x0 + x1) / 2, (y0 + y1) / 2)
+        self.canvas.tag_raise(self.winner_item)
+        self.chaos_due = time.monotonic()
+        self.animate_chaos_frame()
+
+    # Takes the next item from a pool, creating it only while the pool is below its cap
+    def recycle_chaos_item(self, pool, cap, index_attr, create):
+        if len(pool) < cap:
+            pool.append(create())
+            return pool[-1]
+        i = getattr(self, index_attr)
+        setattr(self, index_attr, (i + 1) % cap)
+        return pool[i]
+
+    def animate_chaos_frame(self):
+        self.chaos_after = None
+        if not self.animation_running:
+            return
+
+        now = time.monotonic()
+        late = (now - self.chaos_due) * 1000 > CHAOS_FRAME_BUDGET_MS
+        self.chaos_due = now + CHAOS_FRAME_MS / 1000
 
-            random_bg = random.choice(colors)
-            self.canvas.configure(bg=random_bg)
+        self.canvas.configure(bg=random.choice(CHAOS_COLORS))
 
+        # a late frame only pulses and shakes; new effects wait until frames are on time again
+        x0, y0, x1, y1 = (int(v) for v in self.view_box())
+        if not late:
             if random.random() < 0.3: # 30% chance per frame
-                text = random.choice(mlg_phrases)
-                x = random.randint(0, self.canvas_size)
-                y = random.randint(0, self.canvas_size)
-                color = random.choice(colors)
-                size = random.randint(20, 40)
-                font = ("Impact", size)
-                tag = f"chaos_{random.randint(0, 10000)}"
-                self.canvas.create_text(x, y, text=text, fill=color, font=font, tags=("chaos", tag))
-                self.animation_objects.append(tag)
+                item = self.recycle_chaos_item(self.chaos_texts, CHAOS_MAX_TEXTS, "chaos_next_text",
+                                               lambda: self.canvas.create_text(0, 0, tags="chaos"))
+                self.canvas.coords(item, random.randint(x0, x1), random.randint(y0, y1))
+                self.canvas.itemconfigure(item, text=random.choice(CHAOS_PHRASES), fill=random.choice(CHAOS_COLORS),
+                                          font=("Impact", random.randint(20, 40)), state="normal")
 
             for _ in range(5):
-                x = random.randint(0, self.canvas_size)
-                y = random.randint(0, self.canvas_size)
-                color = random.choice(colors)
+                item = self.recycle_chaos_item(self.chaos_dots, CHAOS_MAX_DOTS, "chaos_next_dot",
+                                               lambda: self.canvas.create_oval(0, 0, 0, 0, tags="chaos"))
+                x = random.randint(x0, x1)
+                y = random.randint(y0, y1)
+                color = random.choice(CHAOS_COLORS)
                 size = random.randint(5, 15)
-                self.canvas.create_oval(x, y, x+size, y+size, fill=color, outline=color, tags="chaos")
+                self.canvas.coords(item, x, y, x + size, y + size)
+                self.canvas.itemconfigure(item, fill=color, outline=color, state="normal")
+            self.canvas.tag_raise(self.winner_item)
 
-            self.canvas.delete("winner_text")
-            pulse_size = 40 + int(20 * math.sin(time.time() * 10))
-            self.canvas.create_text(self.canvas_size/2, self.canvas_size/2, text=win_text, 
-                                    font=("Impact", pulse_size), fill="white", tags="winner_text")
-            
-            dx = random.randint(-5, 5)
-            dy = random.randint(-5, 5)
-            self.canvas.move("all", dx, dy)
+        self.winner_font.configure(size=40 + int(20 * math.sin(now * 10)))
 
-            # Loop
-            self.root.after(100, animate_frame)
+        # only the celebration's own items shake; the winner text jitters around the view centre
+        self.canvas.move("chaos", random.randint(-5, 5), random.randint(-5, 5))
+        self.canvas.coords(self.winner_item, (x0 + x1) / 2 + random.randint(-5, 5), (y0 + y1) / 2 + random.randint(-5, 5))
 
-        import time
-        animate_frame()
+        self.chaos_after = self.root.after(CHAOS_FRAME_MS, self.animate_chaos_frame)
 
-    # Stops the animation
+    # Stops the animation and hides its pooled items
     def stop_mlg_chaos(self):
         self.animation_running = False
-        self.canvas.delete("chaos")
-        self.canvas.delete("winner_text")
+        if self.chaos_after is not None:
+            self.root.after_cancel(self.chaos_after)
+            self.chaos_after = None
+        self.canvas.itemconfigure("chaos", state="hidden")
+        self.canvas.itemconfigure("winner_text", state="hidden")
         self.canvas.configure(bg=THEME["board_bg"])
+
+    def on_animations_toggle(self):
+        if not self.animations_var.get() and self.animation_running:
+            self.stop_mlg_chaos()
+            if self.game is not None and self.game.game_over:
+                winner = self.game.winner
+                self.turn_label.config(text=f"{winner} WINS!" if winner else "DRAW!", fg=THEME["fg_text"])
+
+    # Instrumentation is only wired in while the overlay is on, so it costs nothing otherwise
+    def on_metrics_toggle(self):
+        if self.metrics_var.get():
+            sos_metrics.METRICS.reset()
+            sos_metrics.enable()
+            self.metrics_label.place(x=4, y=4)
+            self.update_metrics_overlay()
+        else:
+            sos_metrics.disable()
+            if self.metrics_after is not None:
+                self.root.after_cancel(self.metrics_after)
+                self.metrics_after = None
+            self.metrics_label.place_forget()
+
+    def update_metrics_overlay(self):
+        metrics = sos_metrics.METRICS
+
+        game_id = self.game.game_id if self.game else None
+
+        def ms(op, label=None, game=None):
+            mean = metrics.mean(op, label, game)
+            return "-" if mean is None else f"{mean * 1000:.2f} ms"
+
+        lines = []
+        for player in (self.game.blue_player, self.game.red_player) if self.game else ():
+            if isinstance(player, ComputerPlayer):
+                lines.append(f"{player.name} AI think: {ms('get_move', player.name, game_id)}")
+        lines.append(f"make_move: {ms('make_move', game=game_id)}")
+        lines.append(f"check_for_sos: {ms('check_for_sos', game=game_id)}")
+        lines.append(f"Claude HTTP: {ms('claude_http')}")
+        self.metrics_label.config(text="\n".join(lines))
+        self.metrics_after = self.root.after(METRICS_REFRESH_MS, self.update_metrics_overlay)
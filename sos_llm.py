@@ -0,0 +1,256 @@
+import hashlib
+import http.client
+import json
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from sos_symmetry import canonical_cells, inverse, map_cell
+
+DEFAULT_BASE_URL = "https://api.anthropic.com"
+API_VERSION = "2023-06-01"
+
+# Status codes worth another try: rate limiting and server-side trouble
+RETRY_STATUSES = {429, 500, 502, 503, 504, 529}
+
+
+class MoveProviderError(Exception):
+    pass
+
+
+class ClaudeMoveClient:
+    """Keep-alive HTTP client for the Messages API, shared across moves.
+
+    One connection is opened lazily and reused until the server closes it
+    or a request fails. Connect and read timeouts are separate, and 429/5xx
+    responses and dropped connections are retried with full-jitter
+    exponential backoff (honouring Retry-After). base_url can point at a
+    local stand-in server for tests and benchmarks.
+    """
+
+    def __init__(self, api_key, model, system_prompt, base_url=DEFAULT_BASE_URL, connect_timeout=3.0,
+                 read_timeout=20.0, max_retries=3, backoff=0.5, max_backoff=8.0, max_tokens=1024, history=1000):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = (parts.path.rstrip("/") or "") + "/v1/messages"
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.model = model
+        self.max_tokens = max_tokens
+        self.system_prompt = system_prompt
+        # built once; only the user message changes between moves
+        self.headers = {
+            'content-type': 'application/json',
+            'x-api-key': api_key,
+            'anthropic-version': API_VERSION,
+            'connection': 'keep-alive',
+        }
+        self._conn = None
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.connections_opened = 0
+        self.latencies = deque(maxlen=history)
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        conn = cls(self.host, self.port, timeout=self.connect_timeout)
+        conn.connect()
+        conn.sock.settimeout(self.read_timeout)
+        self.connections_opened += 1
+        return conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _sleep_before_retry(self, attempt, retry_after=None, cancel=None):
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        if retry_after:
+            try:
+                delay = max(delay, min(self.max_backoff, float(retry_after)))
+            except ValueError:
+                pass
+        if cancel is None:
+            time.sleep(delay)
+        else:
+            cancel.wait(delay)
+
+    # One round trip; returns (status, headers, body bytes)
+    def _send(self, body):
+        if self._conn is None:
+            self._conn = self._connect()
+        try:
+            self._conn.request("POST", self.path, body=body, headers=self.headers)
+            response = self._conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self._conn.close()
+            self._conn = None
+            raise
+        if response.will_close:
+            self._conn.close()
+            self._conn = None
+        return response.status, response.headers, data
+
+    def complete(self, user_message, cancel=None):
+        """Sends one user message and returns the reply text.
+
+        If the optional threading.Event `cancel` gets set, no further
+        attempts are made (a request already in flight still runs to its
+        timeout) and MoveProviderError is raised.
+        """
+        body = json.dumps({
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "system": self.system_prompt,
+            "messages": [{"role": "user", "content": user_message}],
+        }).encode('utf-8')
+
+        # the lock guards the connection and the counters only, never a backoff sleep,
+        # so one caller waiting out a 429 doesn't hold up every other thread
+        with self._lock:
+            self.calls += 1
+        start = time.perf_counter()
+        try:
+            for attempt in range(self.max_retries + 1):
+                if cancel is not None and cancel.is_set():
+                    raise MoveProviderError("request cancelled")
+                last_try = attempt == self.max_retries
+                try:
+                    with self._lock:
+                        status, headers, data = self._send(body)
+                except (OSError, http.client.HTTPException) as e:
+                    if last_try:
+                        raise MoveProviderError(f"request failed: {e}") from e
+                    with self._lock:
+                        self.retries += 1
+                    self._sleep_before_retry(attempt, cancel=cancel)
+                    continue
+                if status in RETRY_STATUSES and not last_try:
+                    with self._lock:
+                        self.retries += 1
+                    self._sleep_before_retry(attempt, headers.get("retry-after"), cancel)
+                    continue
+                if status != 200:
+                    raise MoveProviderError(f"HTTP {status}: {data[:200].decode('utf-8', 'replace')}")
+                result = json.loads(data.decode('utf-8'))
+                return result['content'][0]['text']
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.latencies.append(time.perf_counter() - start)
+
+    def stats(self):
+        times = sorted(self.latencies)
+
+        def pct(p):
+            return times[min(len(times) - 1, int(p * len(times)))] if times else 0.0
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "connections_opened": self.connections_opened,
+            "mean_s": sum(times) / len(times) if times else 0.0,
+            "p50_s": pct(0.50),
+            "p95_s": pct(0.95),
+            "max_s": times[-1] if times else 0.0,
+        }
+
+
+class LLMMoveCache:
+    """On-disk LRU of model move decisions, shared by every rotation and reflection.
+
+    Positions are keyed by the canonical (smallest of the 8 symmetric)
+    board plus the side to move and the mode. Moves are stored in the
+    canonical orientation and mapped back onto the real board on a hit.
+    Entries past max_entries are evicted least recently used first.
+    read_only=True never writes, not even the recency stamps.
+    """
+
+    def __init__(self, path, max_entries=100000, read_only=False):
+        self.path = path
+        self.max_entries = max_entries
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if read_only:
+            self._db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS moves ("
+                             "key TEXT PRIMARY KEY, row INTEGER, col INTEGER, piece TEXT, last_used INTEGER)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS moves_last_used ON moves (last_used)")
+            self._db.commit()
+        self._clock = self._db.execute("SELECT COALESCE(MAX(last_used), 0) FROM moves").fetchone()[0]
+        # kept up to date by put() so eviction doesn't count the table on every write
+        self._count = self._db.execute("SELECT COUNT(*) FROM moves").fetchone()[0]
+
+    @staticmethod
+    def _key(cells, n, side, mode):
+        canonical, t = canonical_cells(cells, n)
+        digest = hashlib.sha1(canonical + f"|{n}|{side}|{mode}".encode()).hexdigest()
+        return digest, t
+
+    def get(self, cells, n, side, mode):
+        key, t = self._key(cells, n, side, mode)
+        with self._lock:
+            row = self._db.execute("SELECT row, col, piece FROM moves WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if not self.read_only:
+                self._clock += 1
+                self._db.execute("UPDATE moves SET last_used = ? WHERE key = ?", (self._clock, key))
+                self._db.commit()
+        r, c = map_cell(inverse(t), row[0], row[1], n)
+        return r, c, row[2]
+
+    def put(self, cells, n, side, mode, move):
+        if self.read_only:
+            return
+        key, t = self._key(cells, n, side, mode)
+        r, c = map_cell(t, move[0], move[1], n)
+        with self._lock:
+            self._clock += 1
+            updated = self._db.execute("UPDATE moves SET row = ?, col = ?, piece = ?, last_used = ? WHERE key = ?",
+                                       (r, c, move[2], self._clock, key)).rowcount
+            if not updated:
+                self._db.execute("INSERT INTO moves VALUES (?, ?, ?, ?, ?)", (key, r, c, move[2], self._clock))
+                self._count += 1
+            extra = self._count - self.max_entries
+            if extra > 0:
+                self._count -= self._db.execute("DELETE FROM moves WHERE key IN "
+                                                "(SELECT key FROM moves ORDER BY last_used LIMIT ?)", (extra,)).rowcount
+            self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM moves").fetchone()[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self)}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
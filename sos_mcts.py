@@ -0,0 +1,177 @@
+import math
+import os
+import random
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from SosGame import PlayerBase, HumanPlayer, SimpleGame
+
+
+class MCTSNode:
+    __slots__ = ('move', 'parent', 'children', 'untried', 'visits', 'wins', 'mover_is_blue')
+
+    def __init__(self, move, parent, mover_is_blue):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = None
+        self.visits = 0
+        # wins are counted for the side that played `move`
+        self.wins = 0.0
+        self.mover_is_blue = mover_is_blue
+
+
+# 1.0 for a Blue win, 0.0 for a Red win, 0.5 for a draw
+def blue_result(game):
+    if isinstance(game, SimpleGame):
+        if game.winner is None:
+            return 0.5
+        # the turn never passes after the winning SOS
+        return 1.0 if game.current_turn_is_blue else 0.0
+    if game.blue_score == game.red_score:
+        return 0.5
+    return 1.0 if game.blue_score > game.red_score else 0.0
+
+
+# One independent search tree; returns {move: (visits, wins)} for the root's children.
+# A set `cancel` event (threading.Event) stops it after the current playout.
+def search_tree(game, playouts=None, time_limit=None, seed=None, exploration=1.4, cancel=None):
+    if playouts is None and time_limit is None:
+        raise ValueError("search_tree needs a playout budget or a time limit")
+    rng = random.Random(seed)
+    g = game.copy()
+    g.disable_threat_map()
+    root = MCTSNode(None, None, not g.current_turn_is_blue)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    done = 0
+
+    while ((playouts is None or done < playouts) and (deadline is None or time.perf_counter() < deadline)
+           and (cancel is None or not cancel.is_set())):
+        node = root
+        played = 0
+
+        # selection
+        while node.untried is not None and not node.untried and node.children:
+            log_n = math.log(node.visits)
+            node = max(node.children, key=lambda ch: ch.wins / ch.visits + exploration * math.sqrt(log_n / ch.visits))
+            g.make_move(*node.move)
+            played += 1
+
+        # expansion
+        if not g.game_over:
+            if node.untried is None:
+                # a side that can score only considers scoring: it keeps the turn (or wins), and
+                # without this a small budget averages a refutation away among random replies
+                node.untried = [(r, c, p) for r, c, p, _ in g.scoring_moves()]
+                if not node.untried:
+                    node.untried = [(r, c, p) for r, c in g.legal_moves() for p in 'SO']
+            if node.untried:
+                i = rng.randrange(len(node.untried))
+                node.untried[i], node.untried[-1] = node.untried[-1], node.untried[i]
+                move = node.untried.pop()
+                child = MCTSNode(move, node, g.current_turn_is_blue)
+                node.children.append(child)
+                g.make_move(*move)
+                played += 1
+                node = child
+
+        # playout, straight through the engine
+        while not g.game_over:
+            r, c = g.random_free_cell(rng)
+            g.make_move(r, c, 'S' if rng.random() < 0.5 else 'O')
+            played += 1
+
+        result = blue_result(g)
+        for _ in range(played):
+            g.undo_move()
+
+        # backpropagation
+        while node is not None:
+            node.visits += 1
+            node.wins += result if node.mover_is_blue else 1.0 - result
+            node = node.parent
+        done += 1
+
+    return {child.move: (child.visits, child.wins) for child in root.children}, done
+
+
+# Worker entry point for root parallelism (must be importable at module level)
+def _search_worker(args):
+    return search_tree(*args)
+
+
+class MCTSPlayer(PlayerBase):
+    __slots__ = ('playouts', 'time_limit', 'workers', 'exploration', 'seed',
+                 'last_playouts', 'last_rate', '_pool', '_finalizer', '__weakref__')
+
+    # Give either a playout budget or a time budget (seconds). workers > 1 runs one
+    # tree per process and merges the root visit counts; workers=None uses every core.
+    # The worker pool lives until close() (or the end of a with block); if neither
+    # happens it is shut down when the player is garbage collected or at exit.
+    def __init__(self, name, piece_choice, playouts=None, time_limit=1.0, workers=1, exploration=1.4, seed=None):
+        if playouts is None and time_limit is None:
+            raise ValueError("MCTSPlayer needs a playout budget or a time limit")
+        super().__init__(name, piece_choice)
+        self.playouts = playouts
+        self.time_limit = None if playouts is not None else time_limit
+        self.workers = workers or os.cpu_count() or 1
+        self.exploration = exploration
+        self.seed = seed
+        self.last_playouts = 0
+        self.last_rate = 0.0
+        self._pool = None
+        self._finalizer = None
+
+    # cancel is only seen by single-process searches; worker processes stop at their budget
+    def get_move(self, game, cancel=None):
+        if game.game_over or game.is_board_full():
+            return None, None, None
+
+        rng = random.Random(self.seed)
+        start = time.perf_counter()
+        if self.workers == 1:
+            stats, self.last_playouts = search_tree(game, self.playouts, self.time_limit, rng.getrandbits(32),
+                                                    self.exploration, cancel)
+        else:
+            stats, self.last_playouts = self._search_parallel(game, rng)
+        elapsed = time.perf_counter() - start
+        self.last_rate = self.last_playouts / elapsed if elapsed > 0 else 0.0
+
+        if not stats:
+            r, c = game.random_free_cell(rng)
+            return r, c, self.piece_choice
+        return max(stats, key=lambda move: stats[move][0])
+
+    def _search_parallel(self, game, rng):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            self._finalizer = weakref.finalize(self, self._pool.shutdown)
+        # ship plain stand-ins for the players so the pool itself never gets pickled
+        snapshot = game.copy()
+        snapshot.blue_player = HumanPlayer(game.blue_player.name, game.blue_player.piece_choice)
+        snapshot.red_player = HumanPlayer(game.red_player.name, game.red_player.piece_choice)
+        per_worker = None if self.playouts is None else -(-self.playouts // self.workers)
+        jobs = [(snapshot, per_worker, self.time_limit, rng.getrandbits(32), self.exploration)
+                for _ in range(self.workers)]
+
+        merged = {}
+        total = 0
+        for stats, done in self._pool.map(_search_worker, jobs):
+            total += done
+            for move, (visits, wins) in stats.items():
+                v, w = merged.get(move, (0, 0.0))
+                merged[move] = (v + visits, w + wins)
+        return merged, total
+
+    def close(self):
+        if self._pool is not None:
+            self._finalizer()
+            self._pool = None
+            self._finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
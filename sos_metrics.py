@@ -0,0 +1,207 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+
+from SosGame import PlayerBase, SOSGameBase, SimpleGame, GeneralGame
+from sos_llm import ClaudeMoveClient
+
+# Histogram bucket upper bounds in seconds (Prometheus "le"); the last bucket is +Inf
+BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+# Per-game series are kept for this many of the most recently seen games
+MAX_GAMES = 256
+
+
+def game_kind(game):
+    return {SimpleGame: "simple", GeneralGame: "general"}.get(type(game), type(game).__name__.lower())
+
+
+# Matches the player type names used by tournaments and game records
+def player_kind(player):
+    kind = type(player).__name__
+    if kind == "ComputerPlayer":
+        return player.strategy
+    return {"HumanPlayer": "human", "AlphaBetaPlayer": "alphabeta", "MCTSPlayer": "mcts"}.get(kind, kind.lower())
+
+
+def _add(table, key, seconds):
+    series = table.get(key)
+    if series is None:
+        series = table[key] = [0, 0.0, [0] * (len(BUCKETS) + 1)]
+    series[0] += 1
+    series[1] += seconds
+    series[2][bisect_left(BUCKETS, seconds)] += 1
+
+
+def _export(table):
+    items = sorted((key, (s[0], s[1], s[2][:])) for key, s in table.items())
+    result = {}
+    for (op, label), (count, total, buckets) in items:
+        cumulative, running = {}, 0
+        for bound, n in zip(BUCKETS + ("+Inf",), buckets):
+            running += n
+            cumulative[str(bound)] = running
+        result.setdefault(op, {})[label] = {"count": count, "sum_s": total, "mean_s": total / count,
+                                            "buckets": cumulative}
+    return result
+
+
+class Metrics:
+    """Call counts and latency histograms keyed by (operation, label), plus
+    the same per game id, where get_move is labelled by player name so two
+    players of one type in the same game stay apart."""
+    __slots__ = ('_lock', '_series', '_games')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (op, label) -> [count, total seconds, per-bucket counts (not cumulative)]
+        self._series = {}
+        # game id -> {(op, label) -> series}, oldest game first
+        self._games = OrderedDict()
+
+    def observe(self, op, label, seconds, game=None, game_label=None):
+        with self._lock:
+            _add(self._series, (op, label), seconds)
+            if game is None:
+                return
+            table = self._games.get(game)
+            if table is None:
+                table = self._games[game] = {}
+                if len(self._games) > MAX_GAMES:
+                    self._games.popitem(last=False)
+            _add(table, (op, label if game_label is None else game_label), seconds)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._games.clear()
+
+    # Mean seconds for an operation, over one label or all of them, optionally in one game; None if never seen
+    def mean(self, op, label=None, game=None):
+        with self._lock:
+            table = self._series if game is None else self._games.get(game, {})
+            picked = [s for (o, l), s in table.items() if o == op and (label is None or l == label)]
+        count = sum(s[0] for s in picked)
+        return sum(s[1] for s in picked) / count if count else None
+
+    def to_dict(self):
+        with self._lock:
+            result = _export(self._series)
+            games = {str(game): _export(table) for game, table in self._games.items()}
+        if games:
+            result["games"] = games
+        return result
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    # Prometheus text exposition format: one histogram family for every instrumented call, and
+    # a separate family for the per-game series so summing over the first never counts a call twice
+    def to_prometheus(self, name="sos_call_seconds", game_name="sos_game_call_seconds"):
+        data = self.to_dict()
+        games = data.pop("games", {})
+        lines = [f"# HELP {name} Latency of instrumented SOS engine, player and API calls.",
+                 f"# TYPE {name} histogram"]
+        _histogram_lines(lines, name, "", data)
+        if games:
+            lines += [f"# HELP {game_name} The same latencies for each of the last {MAX_GAMES} games.",
+                      f"# TYPE {game_name} histogram"]
+            for game, ops in games.items():
+                _histogram_lines(lines, game_name, f'game="{game}",', ops)
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(lines, name, scope, ops):
+    for op, labels in ops.items():
+        for label, series in labels.items():
+            tags = f'{scope}op="{op}",label="{label}"'
+            for bound, n in series["buckets"].items():
+                lines.append(f'{name}_bucket{{{tags},le="{bound}"}} {n}')
+            lines.append(f"{name}_sum{{{tags}}} {series['sum_s']}")
+            lines.append(f"{name}_count{{{tags}}} {series['count']}")
+
+
+METRICS = Metrics()
+
+# (class, attribute) -> original function while instrumentation is on
+_originals = {}
+
+
+# The game a call belongs to, and its label within that game; (None, None) if it has no game
+def _engine_scope(game, args):
+    return game.game_id, game_kind(game)
+
+
+def _player_scope(player, args):
+    game = args[0] if args else None
+    return getattr(game, "game_id", None), player.name
+
+
+def _no_scope(obj, args):
+    return None, None
+
+
+def _timed(func, op, label_of, scope_of, metrics):
+    def timed(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            game, game_label = scope_of(self, args)
+            metrics.observe(op, label_of(self), elapsed, game, game_label)
+    timed.__name__ = func.__name__
+    timed.__doc__ = func.__doc__
+    timed.__wrapped__ = func
+    return timed
+
+
+def _player_classes():
+    # the search players are only instrumented if something could use them
+    import sos_search, sos_mcts  # noqa: F401
+    pending, found = [PlayerBase], []
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        if "get_move" in vars(cls) and not getattr(cls.get_move, "__isabstractmethod__", False):
+            found.append(cls)
+    return found
+
+
+def enable(metrics=METRICS):
+    """Wraps the hot paths so every call is timed into `metrics`.
+
+    Nothing is wrapped until this is called, and disable() puts the
+    original functions back, so switched off the cost is exactly zero.
+    """
+    if _originals:
+        return
+    hooks = [(SimpleGame, "make_move", "make_move", game_kind, _engine_scope),
+             (GeneralGame, "make_move", "make_move", game_kind, _engine_scope),
+             (SOSGameBase, "_check_for_sos", "check_for_sos", game_kind, _engine_scope),
+             (SOSGameBase, "is_board_full", "is_board_full", game_kind, _engine_scope),
+             (ClaudeMoveClient, "_send", "claude_http", lambda client: client.model, _no_scope)]
+    hooks += [(cls, "get_move", "get_move", player_kind, _player_scope) for cls in _player_classes()]
+    for cls, attr, op, label_of, scope_of in hooks:
+        func = vars(cls)[attr]
+        _originals[cls, attr] = func
+        setattr(cls, attr, _timed(func, op, label_of, scope_of, metrics))
+
+
+def disable():
+    for (cls, attr), func in _originals.items():
+        setattr(cls, attr, func)
+    _originals.clear()
+
+
+def enabled():
+    return bool(_originals)
+
+
+def write(path, metrics=METRICS):
+    """Writes Prometheus text for a .prom/.txt path and JSON otherwise."""
+    text = metrics.to_prometheus() if path.endswith((".prom", ".txt")) else metrics.to_json()
+    with open(path, "w") as f:
+        f.write(text)
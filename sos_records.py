@@ -0,0 +1,226 @@
+import os
+import struct
+import sys
+from array import array
+
+from SosGame import SimpleGame
+
+MAGIC = b"SG"
+VERSION = 2
+# magic, version, board size, mode, blue type, red type, result, blue score, red score, move count.
+# Version 1 had u16 scores, which a general game on a big board can outgrow; it is still readable.
+HEADERS = {1: struct.Struct("<2sBHBBBBHHI"), 2: struct.Struct("<2sBHBBBBIII")}
+HEADER = HEADERS[VERSION]
+# magic and version, shared by every layout
+PREFIX = struct.Struct("<2sB")
+OFFSET = struct.Struct("<Q")
+MOVE_SIZE = 4
+
+MODES = ("simple", "general")
+PLAYER_TYPES = ("human", "computer", "random", "heuristic", "alphabeta", "mcts")
+RESULTS = (None, "Blue", "Red")
+
+
+# Moves are packed like a compact game's history: cell_index << 1 | (0 for S, 1 for O), as little-endian u32
+def pack_moves(moves, n):
+    return struct.pack(f"<{len(moves)}I", *((r * n + c) << 1 | (piece == 'O') for r, c, piece in moves))
+
+
+def unpack_moves(data, n):
+    return [(*divmod(value >> 1, n), 'O' if value & 1 else 'S')
+            for value in struct.unpack(f"<{len(data) // MOVE_SIZE}I", data)]
+
+
+class GameRecord:
+    __slots__ = ('size', 'mode', 'blue_type', 'red_type', 'winner', 'blue_score', 'red_score', 'moves')
+
+    def __init__(self, size, mode, blue_type, red_type, winner, blue_score, red_score, moves):
+        self.size = size
+        self.mode = mode
+        self.blue_type = blue_type
+        self.red_type = red_type
+        self.winner = winner
+        self.blue_score = blue_score
+        self.red_score = red_score
+        self.moves = moves
+
+    @classmethod
+    def from_game(cls, game, blue_type, red_type):
+        mode = "simple" if isinstance(game, SimpleGame) else "general"
+        # winner holds a player name; records always say "Blue" or "Red"
+        if game.winner is None:
+            winner = None
+        else:
+            winner = "Blue" if game.winner == game.blue_player.name else "Red"
+        return cls(game.board_size, mode, blue_type, red_type, winner,
+                   getattr(game, "blue_score", 0), getattr(game, "red_score", 0), list(game.history))
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, self.size, MODES.index(self.mode), PLAYER_TYPES.index(self.blue_type),
+                             PLAYER_TYPES.index(self.red_type), RESULTS.index(self.winner),
+                             self.blue_score, self.red_score, len(self.moves))
+        return header + pack_moves(self.moves, self.size)
+
+
+# Reads the header at the file's position; returns (fields, header size), or None at a short read
+def _read_header(f):
+    offset = f.tell()
+    prefix = f.read(PREFIX.size)
+    if len(prefix) < PREFIX.size:
+        return None
+    magic, version = PREFIX.unpack(prefix)
+    header = HEADERS.get(version)
+    if magic != MAGIC or header is None:
+        raise ValueError(f"no game record at offset {offset}")
+    rest = f.read(header.size - PREFIX.size)
+    if len(rest) < header.size - PREFIX.size:
+        return None
+    _, _, size, mode, blue, red, result, blue_score, red_score, count = header.unpack(prefix + rest)
+    fields = size, MODES[mode], PLAYER_TYPES[blue], PLAYER_TYPES[red], RESULTS[result], blue_score, red_score, count
+    return fields, header.size
+
+
+def _read_record(f):
+    size, mode, blue, red, winner, blue_score, red_score, count = _read_header(f)[0]
+    moves = unpack_moves(f.read(MOVE_SIZE * count), size)
+    return GameRecord(size, mode, blue, red, winner, blue_score, red_score, moves)
+
+
+class GameRecordWriter:
+    """Appends games to a record file and keeps its .idx sidecar of byte offsets in step."""
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        end = _check_index(path)
+        # drop a game cut short by a crash, or new games would land behind its garbage
+        if end is not None and end < os.path.getsize(path):
+            os.truncate(path, end)
+        self._data = open(path, "ab")
+        self._index = open(self.index_path, "ab")
+
+    def append(self, record):
+        self._data.seek(0, os.SEEK_END)
+        offset = self._data.tell()
+        self._data.write(record.to_bytes())
+        self._data.flush()
+        self._index.write(OFFSET.pack(offset))
+        self._index.flush()
+        return offset
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Rebuilds the sidecar when it is missing or doesn't cover the whole data file. Returns where
+# the last complete game ends, which is short of the file size if a trailing game was cut off.
+def _check_index(path):
+    index_path = path + ".idx"
+    if not os.path.exists(path):
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        return None
+    data_size = os.path.getsize(path)
+    if os.path.exists(index_path):
+        count = os.path.getsize(index_path) // OFFSET.size
+        if count == 0 and data_size == 0:
+            return 0
+        if count:
+            with open(index_path, "rb") as f:
+                f.seek((count - 1) * OFFSET.size)
+                last = OFFSET.unpack(f.read(OFFSET.size))[0]
+            with open(path, "rb") as f:
+                f.seek(last)
+                header = _read_header(f)
+            if header is not None and last + header[1] + MOVE_SIZE * header[0][-1] == data_size:
+                return data_size
+    end = 0
+    with open(path, "rb") as f, open(index_path, "wb") as index:
+        for offset, end in _scan(f, data_size):
+            index.write(OFFSET.pack(offset))
+    return end
+
+
+# Yields (offset, end) for every complete game, stopping at one cut off by the end of the file
+def _scan(f, data_size):
+    offset = 0
+    while True:
+        f.seek(offset)
+        header = _read_header(f)
+        if header is None:
+            return
+        fields, header_size = header
+        end = offset + header_size + MOVE_SIZE * fields[-1]
+        if end > data_size:
+            return
+        yield offset, end
+        offset = end
+
+
+class GameRecordReader:
+    """Random access to games by number through the .idx sidecar, plus a streaming scan."""
+
+    def __init__(self, path):
+        self.path = path
+        _check_index(path)
+        with open(path + ".idx", "rb") as f:
+            self._offsets = array('Q')
+            self._offsets.frombytes(f.read())
+        if sys.byteorder == "big":
+            self._offsets.byteswap()
+        self._data = open(path, "rb")
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _read_at(self, offset):
+        self._data.seek(offset)
+        return _read_record(self._data)
+
+    def __getitem__(self, i):
+        return self._read_at(self._offsets[i])
+
+    def __iter__(self):
+        for offset in self._offsets:
+            yield self._read_at(offset)
+
+    def close(self):
+        self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record_count(path):
+    _check_index(path)
+    return os.path.getsize(path + ".idx") // OFFSET.size
+
+
+def iter_records(path, start=0, stop=None):
+    """Streams games start..stop-1 in file order, one at a time.
+
+    Only the offset of the first game is looked up in the sidecar; the
+    rest is a sequential buffered read, so memory stays at one game
+    however large the file is.
+    """
+    count = record_count(path)
+    stop = count if stop is None else min(stop, count)
+    if start >= stop:
+        return
+    with open(path + ".idx", "rb") as index:
+        index.seek(start * OFFSET.size)
+        offset = OFFSET.unpack(index.read(OFFSET.size))[0]
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for _ in range(start, stop):
+            yield _read_record(f)
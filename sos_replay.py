@@ -0,0 +1,84 @@
+from SosGame import SimpleGame, GeneralGame, HumanPlayer
+
+# Checkpoints kept per replay when checkpoint_every isn't given; long games space them out
+DEFAULT_CHECKPOINTS = 64
+MIN_CHECKPOINT_EVERY = 16
+
+
+class Replay:
+    """Seekable playback of one recorded game.
+
+    The game is played through once up front, keeping a copy of the
+    position every `checkpoint_every` moves and the SOS lines each move
+    made. seek(k) then either steps from the current position with
+    make_move/undo_move or restores the nearest checkpoint at or below k
+    and plays the rest, whichever touches fewer moves.
+    """
+    __slots__ = ('record', 'checkpoint_every', 'game', 'position', '_checkpoints', '_lines', '_movers')
+
+    def __init__(self, record, checkpoint_every=None):
+        self.record = record
+        if checkpoint_every is None:
+            checkpoint_every = max(MIN_CHECKPOINT_EVERY, -(-len(record.moves) // DEFAULT_CHECKPOINTS))
+        self.checkpoint_every = checkpoint_every
+
+        game_cls = SimpleGame if record.mode == "simple" else GeneralGame
+        game = game_cls(record.size, HumanPlayer("Blue", "S"), HumanPlayer("Red", "S"), compact=True)
+        self._checkpoints = []
+        self._lines = []
+        self._movers = []
+        for i, (r, c, piece) in enumerate(record.moves):
+            if i % checkpoint_every == 0:
+                self._checkpoints.append(game.copy())
+            self._movers.append(game.current_turn_is_blue)
+            soses, ok = game.make_move(r, c, piece)
+            if not ok:
+                raise ValueError(f"illegal move {i} in record: {r}, {c}, {piece}")
+            self._lines.append(soses)
+        if len(record.moves) % checkpoint_every == 0:
+            self._checkpoints.append(game.copy())
+
+        self.game = self._checkpoints[0].copy()
+        self.position = 0
+
+    def __len__(self):
+        return len(self.record.moves)
+
+    def at_end(self):
+        return self.position == len(self.record.moves)
+
+    # SOS lines completed by move i and whether Blue made it
+    def lines(self, i):
+        return self._lines[i], self._movers[i]
+
+    # Moves to position k (0 = empty board, len = final position) and returns the moves
+    # whose cells differ from before: (i, r, c, piece) with piece '' for a cleared cell
+    def seek(self, k):
+        k = max(0, min(k, len(self.record.moves)))
+        old = self.position
+        if k == old:
+            return []
+
+        base = k - k % self.checkpoint_every
+        if k - base < abs(k - old):
+            self.game = self._checkpoints[base // self.checkpoint_every].copy()
+            for r, c, piece in self.record.moves[base:k]:
+                self.game.make_move(r, c, piece)
+        elif k > old:
+            for r, c, piece in self.record.moves[old:k]:
+                self.game.make_move(r, c, piece)
+        else:
+            for _ in range(old - k):
+                self.game.undo_move()
+        self.position = k
+
+        moves = self.record.moves
+        if k > old:
+            return [(i, *moves[i]) for i in range(old, k)]
+        return [(i, moves[i][0], moves[i][1], '') for i in range(old - 1, k - 1, -1)]
+
+    def step_forward(self):
+        return self.seek(self.position + 1)
+
+    def step_back(self):
+        return self.seek(self.position - 1)
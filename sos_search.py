@@ -0,0 +1,217 @@
+import time
+
+from SosGame import PlayerBase, SimpleGame
+from sos_symmetry import canonical_key, from_canonical, to_canonical
+
+# Scores are from the side to move. In a simple game WIN_SCORE means "wins";
+# in a general game values are the net points still to be made from here on.
+WIN_SCORE = 10000
+INF = 10 ** 9
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Mixed into general-game keys so one table never mixes simple and general scores
+GENERAL_KEY_SALT = 0x9E3779B97F4A7C15
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+# Fixed-size, direct-mapped transposition table keyed by the canonical Zobrist
+# hash, so all 8 symmetric copies of a position share one entry (best moves are
+# stored in the canonical frame). A slot is replaced when it is
+# empty, holds the same position, was written by an older search, or holds a
+# shallower result than the new one (depth-preferred with ageing).
+class TranspositionTable:
+    __slots__ = ('mask', 'slots', 'generation', 'hits', 'stores')
+
+    def __init__(self, size_bits=16):
+        self.mask = (1 << size_bits) - 1
+        self.slots = [None] * (1 << size_bits)
+        self.generation = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def lookup(self, key):
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, value, flag, move):
+        i = key & self.mask
+        old = self.slots[i]
+        if old is None or old[0] == key or old[5] != self.generation or depth >= old[1]:
+            self.slots[i] = (key, depth, value, flag, move, self.generation)
+            self.stores += 1
+
+
+class AlphaBetaPlayer(PlayerBase):
+    __slots__ = ('time_limit', 'max_depth', 'table', 'book', 'nodes', 'last_depth', 'last_value', '_deadline', '_cancel', '_partial', '_salt')
+
+    # time_limit: wall-clock seconds per move; max_depth caps the iterative deepening
+    # book: optional sos_book.OpeningBook tried before searching
+    def __init__(self, name, piece_choice, time_limit=1.0, max_depth=None, table_bits=16, book=None):
+        super().__init__(name, piece_choice)
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.table = TranspositionTable(table_bits)
+        self.book = book
+        self.nodes = 0
+        self.last_depth = 0
+        # None until a search (or book hit) has produced a value for the current position
+        self.last_value = None
+
+    # A set `cancel` event ends the search like running out of time does
+    def get_move(self, game, cancel=None):
+        self.last_value = None
+        if game.game_over or game.is_board_full():
+            return None, None, None
+
+        if self.book is not None:
+            hit = self.book.lookup(game)
+            if hit is not None:
+                self.last_value = hit[3]
+                return hit[:3]
+
+        self._deadline = time.perf_counter() + self.time_limit
+        self._cancel = cancel
+        self.nodes = 0
+        self.last_depth = 0
+        self.table.new_search()
+
+        g = game.copy()
+        g.enable_threat_map()
+        simple = isinstance(g, SimpleGame)
+        self._salt = 0 if simple else GENERAL_KEY_SALT
+        root_moves = self._ordered_moves(g, None)
+        best_move = root_moves[0]
+
+        max_depth = g.free_count()
+        if self.max_depth is not None:
+            max_depth = min(max_depth, self.max_depth)
+
+        for depth in range(1, max_depth + 1):
+            self._partial = None
+            try:
+                value, move = self._search_root(g, root_moves, depth, simple)
+            except SearchTimeout:
+                # the unfinished iteration still counts once the old best move has been re-searched
+                if self._partial is not None:
+                    best_move = self._partial[1]
+                break
+            best_move = move
+            self.last_depth = depth
+            self.last_value = value
+            # previous best goes first next iteration
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            if abs(value) >= WIN_SCORE - 1000:
+                break
+
+        return best_move
+
+    def _search_root(self, g, moves, depth, simple):
+        alpha, beta = -INF, INF
+        best_value, best_move = -INF, moves[0]
+        for move in moves:
+            value = self._child_value(g, move, depth, alpha, beta, simple, 1)
+            if value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+            self._partial = (best_value, best_move)
+        key, t = canonical_key(g)
+        key ^= self._salt
+        self.table.store(key, depth, best_value, EXACT, to_canonical(best_move, t, g.board_size))
+        return best_value, best_move
+
+    # Plays one move, searches below it and takes it back. Handles the extra turn
+    # after an SOS in the general game by not negating when the mover stays the same.
+    def _child_value(self, g, move, depth, alpha, beta, simple, ply):
+        r, c, piece = move
+        mover_is_blue = g.current_turn_is_blue
+        soses, _ = g.make_move(r, c, piece)
+        try:
+            if simple:
+                if soses:
+                    return WIN_SCORE - ply
+                if g.game_over:
+                    return 0
+                return -self._negamax(g, depth - 1, -beta, -alpha, simple, ply + 1)
+            points = len(soses)
+            if g.game_over:
+                return points
+            if g.current_turn_is_blue == mover_is_blue:
+                return points + self._negamax(g, depth - 1, alpha - points, beta - points, simple, ply + 1)
+            return -self._negamax(g, depth - 1, -beta, -alpha, simple, ply + 1)
+        finally:
+            g.undo_move()
+
+    def _negamax(self, g, depth, alpha, beta, simple, ply):
+        self.nodes += 1
+        if time.perf_counter() > self._deadline or (self._cancel is not None and self._cancel.is_set()):
+            raise SearchTimeout()
+
+        if depth <= 0:
+            return self._evaluate(g, simple, ply)
+
+        key, t = canonical_key(g)
+        key ^= self._salt
+        alpha_orig = alpha
+        tt_move = None
+        entry = self.table.lookup(key)
+        if entry is not None:
+            _, e_depth, e_value, e_flag, tt_move, _ = entry
+            if tt_move is not None:
+                tt_move = from_canonical(tt_move, t, g.board_size)
+            if e_depth >= depth:
+                if e_flag == EXACT:
+                    return e_value
+                if e_flag == LOWER:
+                    alpha = max(alpha, e_value)
+                elif e_flag == UPPER:
+                    beta = min(beta, e_value)
+                if alpha >= beta:
+                    return e_value
+
+        best_value, best_move = -INF, None
+        for move in self._ordered_moves(g, tt_move):
+            value = self._child_value(g, move, depth, alpha, beta, simple, ply)
+            if value > best_value:
+                best_value, best_move = value, move
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        if best_value <= alpha_orig:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        if best_move is not None:
+            best_move = to_canonical(best_move, t, g.board_size)
+        self.table.store(key, depth, best_value, flag, best_move)
+        return best_value
+
+    # Leaf estimate: whoever is to move can at least cash in the biggest SOS on offer
+    def _evaluate(self, g, simple, ply):
+        best = max((points for _, _, _, points in g.scoring_moves()), default=0)
+        if simple:
+            return WIN_SCORE - ply - 1 if best else 0
+        return best
+
+    # Scoring moves first, then quiet moves, moves that hand out setups last
+    def _ordered_moves(self, g, tt_move):
+        rated = sorted(g.rate_moves(), key=lambda m: (m[3], -m[4]), reverse=True)
+        moves = [(r, c, piece) for r, c, piece, _, _ in rated]
+        if tt_move is not None and tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+        return moves
@@ -0,0 +1,100 @@
+import random
+from functools import lru_cache
+from operator import itemgetter
+
+# The 8 symmetries of a square board. Transform t transposes if t & 4,
+# then flips rows if t & 1 and columns if t & 2; 0 is the identity.
+TRANSFORMS = range(8)
+
+
+def map_cell(t, r, c, n):
+    if t & 4:
+        r, c = c, r
+    if t & 1:
+        r = n - 1 - r
+    if t & 2:
+        c = n - 1 - c
+    return r, c
+
+
+@lru_cache(maxsize=None)
+def inverse(t):
+    for u in TRANSFORMS:
+        if all(map_cell(u, *map_cell(t, r, c, 3), 3) == (r, c) for r in range(3) for c in range(3)):
+            return u
+    raise ValueError(t)
+
+
+# For each transform, the source index of every destination cell: new[i] = old[src[i]]
+@lru_cache(maxsize=16)
+def permutations(n):
+    perms = []
+    for t in TRANSFORMS:
+        src = [0] * (n * n)
+        for r in range(n):
+            for c in range(n):
+                tr, tc = map_cell(t, r, c, n)
+                src[tr * n + tc] = r * n + c
+        perms.append(itemgetter(*src))
+    return perms
+
+
+def transform_cells(cells, n, t):
+    if n * n == 1:
+        return bytes(cells)
+    return bytes(permutations(n)[t](cells))
+
+
+def canonical_cells(cells, n):
+    """(smallest of the 8 transformed cell strings, the transform that gives it)."""
+    return min((transform_cells(cells, n, t), t) for t in TRANSFORMS)
+
+
+# Zobrist keys for every (cell, piece). The seed is fixed: stored keys (opening
+# books, caches) depend on these values staying the same between runs.
+@lru_cache(maxsize=8)
+def zobrist_keys(n, seed=0x5053):
+    rng = random.Random(seed * 1000003 + n)
+    return [(0, rng.getrandbits(64), rng.getrandbits(64)) for _ in range(n * n)]
+
+
+# table[idx][code] holds, for each transform t, the key that (idx, code) lands on
+# after t, so XOR-ing it in keeps the hashes of all 8 transformed boards at once
+@lru_cache(maxsize=4)
+def symmetry_zobrist(n):
+    keys = zobrist_keys(n)
+    table = []
+    for r in range(n):
+        for c in range(n):
+            dest = [tr * n + tc for tr, tc in (map_cell(t, r, c, n) for t in TRANSFORMS)]
+            table.append((None,
+                          tuple(keys[d][1] for d in dest),
+                          tuple(keys[d][2] for d in dest)))
+    return table
+
+
+def canonical_key(game):
+    """(canonical hash, transform) for a game's position, equal for all 8 symmetric boards.
+
+    The hashes are kept up to date by the game on every move once asked
+    for, so this is 8 comparisons. Map a move found on the real board
+    into the canonical frame with to_canonical and back with from_canonical.
+    """
+    hashes = game.symmetry_hashes()
+    key = min(hashes)
+    return key, hashes.index(key)
+
+
+def to_canonical(move, t, n):
+    r, c = map_cell(t, move[0], move[1], n)
+    return (r, c) + tuple(move[2:])
+
+
+def from_canonical(move, t, n):
+    r, c = map_cell(inverse(t), move[0], move[1], n)
+    return (r, c) + tuple(move[2:])
+
+
+def canonical_board(game):
+    """The exact canonical position (cell codes of the smallest transformed board) and its transform."""
+    return canonical_cells(game._cells, game.board_size)
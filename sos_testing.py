@@ -0,0 +1,18 @@
+"""Helpers shared by the test modules."""
+import random
+
+from SosGame import ComputerPlayer
+
+
+def play_out(game):
+    """Plays `game` to the end with each side's own get_move and returns it."""
+    while not game.game_over:
+        r, c, piece = game.get_current_player().get_move(game)
+        game.make_move(r, c, piece)
+    return game
+
+
+def random_game(cls, size, seed):
+    """A finished game between two random ComputerPlayers; the same seed plays the same game."""
+    random.seed(seed)
+    return play_out(cls(size, ComputerPlayer("Blue", "S", verbose=False), ComputerPlayer("Red", "O", verbose=False)))
@@ -0,0 +1,153 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from SosGame import SimpleGame, GeneralGame, ComputerPlayer
+from sos_search import AlphaBetaPlayer
+from sos_mcts import MCTSPlayer
+import sos_metrics
+from sos_records import GameRecord, GameRecordWriter
+
+PLAYER_TYPES = ("random", "heuristic", "alphabeta", "mcts")
+
+
+# Builds a headless player; names must stay "Blue"/"Red" so winners line up with GeneralGame
+def make_player(kind, name, piece, time_limit=0.1, playouts=200, seed=None):
+    if kind in ("random", "heuristic"):
+        return ComputerPlayer(name, piece, strategy=kind, verbose=False)
+    if kind == "alphabeta":
+        return AlphaBetaPlayer(name, piece, time_limit=time_limit)
+    if kind == "mcts":
+        return MCTSPlayer(name, piece, playouts=playouts, seed=seed)
+    raise ValueError(f"Unknown player type: {kind}")
+
+
+# Plays one game; `a_is_blue` says which side player A takes. Everything random is
+# seeded from game_seed so a game replays identically on any worker. With record=True
+# the finished game's GameRecord is appended to the outcome for the caller to write.
+def play_game(spec, record=False):
+    size, mode, kind_a, kind_b, a_is_blue, game_seed, time_limit, playouts = spec
+    random.seed(game_seed)
+    blue_kind, red_kind = (kind_a, kind_b) if a_is_blue else (kind_b, kind_a)
+    blue = make_player(blue_kind, "Blue", "S", time_limit, playouts, game_seed)
+    red = make_player(red_kind, "Red", "S", time_limit, playouts, game_seed + 1)
+    game_cls = SimpleGame if mode == "simple" else GeneralGame
+    game = game_cls(size, blue, red, compact=True)
+
+    try:
+        while not game.game_over:
+            r, c, piece = game.get_current_player().get_move(game)
+            _, ok = game.make_move(r, c, piece)
+            if not ok:
+                raise RuntimeError(f"{game.get_turn_owner_name()} ({game.get_current_player().__class__.__name__}) made an illegal move: {r}, {c}, {piece}")
+    finally:
+        for player in (blue, red):
+            if isinstance(player, MCTSPlayer):
+                player.close()
+
+    blue_score = getattr(game, "blue_score", 0)
+    red_score = getattr(game, "red_score", 0)
+    outcome = (a_is_blue, game.winner, blue_score, red_score, len(game.history))
+    if record:
+        outcome += (GameRecord.from_game(game, blue_kind, red_kind),)
+    return outcome
+
+
+class TournamentResult:
+    __slots__ = ('games', 'a_wins', 'b_wins', 'draws', 'a_points', 'b_points', 'moves', 'elapsed')
+
+    def __init__(self):
+        self.games = self.a_wins = self.b_wins = self.draws = 0
+        self.a_points = self.b_points = self.moves = 0
+        self.elapsed = 0.0
+
+    def add(self, outcome):
+        a_is_blue, winner, blue_score, red_score, moves = outcome[:5]
+        self.games += 1
+        self.moves += moves
+        a_side = "Blue" if a_is_blue else "Red"
+        if winner is None:
+            self.draws += 1
+        elif winner == a_side:
+            self.a_wins += 1
+        else:
+            self.b_wins += 1
+        self.a_points += blue_score if a_is_blue else red_score
+        self.b_points += red_score if a_is_blue else blue_score
+
+    def games_per_second(self):
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+
+# Plays `games` games of A against B, swapping colours every game unless swap=False.
+# record_path: optional sos_records file every finished game is appended to.
+def run_tournament(kind_a, kind_b, games, size=3, mode="simple", seed=0, workers=1,
+                   swap=True, time_limit=0.1, playouts=200, record_path=None):
+    specs = [(size, mode, kind_a, kind_b, not swap or i % 2 == 0, seed * 1000003 + i, time_limit, playouts)
+             for i in range(games)]
+    result = TournamentResult()
+    writer = GameRecordWriter(record_path) if record_path else None
+    play = partial(play_game, record=writer is not None)
+    pool = None
+    start = time.perf_counter()
+    try:
+        if workers == 1:
+            outcomes = map(play, specs)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            outcomes = pool.map(play, specs, chunksize=max(1, games // (workers * 8)))
+        for outcome in outcomes:
+            result.add(outcome)
+            if writer is not None:
+                writer.append(outcome[5])
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if writer is not None:
+            writer.close()
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def add_arguments(parser):
+    parser.add_argument("player_a", choices=PLAYER_TYPES)
+    parser.add_argument("player_b", choices=PLAYER_TYPES)
+    parser.add_argument("-n", "--games", type=int, default=100)
+    parser.add_argument("-s", "--size", type=int, default=3)
+    parser.add_argument("-m", "--mode", choices=("simple", "general"), default="simple")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-j", "--workers", type=int, default=1, help="processes to spread games over")
+    parser.add_argument("--no-swap", action="store_true", help="player A always plays Blue (moves first)")
+    parser.add_argument("--time-limit", type=float, default=0.1, help="seconds per move for alphabeta")
+    parser.add_argument("--playouts", type=int, default=200, help="playouts per move for mcts")
+    parser.add_argument("--record", metavar="FILE", help="append every game to this game record file")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="time engine and player calls and write them here (.prom for Prometheus text, else JSON); needs -j 1")
+    parser.set_defaults(func=main)
+
+
+def main(args):
+    if args.size < 3:
+        print("Board size must be at least 3.")
+        return 2
+    if args.metrics:
+        if args.workers != 1:
+            print("--metrics only sees games played in this process; use -j 1.")
+            return 2
+        sos_metrics.enable()
+    try:
+        result = run_tournament(args.player_a, args.player_b, args.games, args.size, args.mode, args.seed,
+                                args.workers, not args.no_swap, args.time_limit, args.playouts, args.record)
+    finally:
+        if args.metrics:
+            sos_metrics.disable()
+            sos_metrics.write(args.metrics)
+    games = max(result.games, 1)
+    print(f"{args.player_a} vs {args.player_b}: {result.games} {args.mode} games on {args.size}x{args.size}")
+    print(f"  {args.player_a} wins: {result.a_wins}  {args.player_b} wins: {result.b_wins}  draws: {result.draws}")
+    if args.mode == "general":
+        print(f"  average score: {args.player_a} {result.a_points / games:.2f}  {args.player_b} {result.b_points / games:.2f}")
+    print(f"  average length: {result.moves / games:.1f} moves")
+    print(f"  {result.games_per_second():.1f} games/s ({result.elapsed:.2f}s)")
+    return 0
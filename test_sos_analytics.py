@@ -0,0 +1,57 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from sos_analytics import GameStats, analyse, write_csv
+from sos_records import GameRecord, GameRecordWriter, iter_records
+
+
+class AnalyticsTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "games.sosrec")
+        self.records = [
+            GameRecord(3, "simple", "random", "heuristic", "Red", 0, 0, [(1, 1, 'O'), (0, 0, 'S'), (2, 2, 'S')]),
+            GameRecord(3, "simple", "heuristic", "random", "Blue", 0, 0, [(1, 1, 'S'), (0, 1, 'O'), (0, 0, 'S'), (0, 2, 'S')]),
+            GameRecord(3, "general", "random", "random", None, 1, 1, [(0, 0, 'S')] + [(1, c, 'O') for c in range(3)]),
+            GameRecord(4, "general", "mcts", "random", "Blue", 3, 0, [(2, 2, 'S'), (0, 0, 'S')]),
+        ]
+        with GameRecordWriter(self.path) as writer:
+            for record in self.records:
+                writer.append(record)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_iter_records_streams_a_range(self):
+        self.assertEqual([r.moves for r in iter_records(self.path, 1, 3)], [r.moves for r in self.records[1:3]])
+        self.assertEqual(list(iter_records(self.path, 4)), [])
+
+    def test_summary(self):
+        summary = analyse([self.path]).to_dict()
+        self.assertEqual(summary["games"], 4)
+        self.assertEqual(summary["by_player_type"]["heuristic"]["wins"], 2)
+        self.assertEqual(summary["by_player_type"]["random"],
+                         {"games": 5, "wins": 0, "losses": 3, "draws": 2, "win_rate": 0.0})
+        self.assertEqual((summary["first_mover"]["wins"], summary["first_mover"]["losses"]), (2, 1))
+        self.assertEqual(summary["general"]["points_per_move"], 5 / 6)
+        self.assertEqual(summary["length"]["histogram"], {"2": 1, "3": 1, "4": 2})
+        self.assertEqual(summary["openings"]["3"][0], {"row": 1, "col": 1, "games": 2})
+
+    def test_chunks_merge_to_the_same_result(self):
+        whole = analyse([self.path]).to_dict()
+        self.assertEqual(analyse([self.path], chunk=1).to_dict(), whole)
+        self.assertEqual(analyse([self.path], workers=2, chunk=3).to_dict(), whole)
+        json.dumps(whole)
+        out = io.StringIO()
+        write_csv(whole, out)
+        self.assertIn("first_mover,wins,2", out.getvalue())
+
+    def test_empty(self):
+        self.assertEqual(GameStats().to_dict()["games"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import importlib.util
+import unittest
+from SosGame import SimpleGame, GeneralGame, HumanPlayer
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np
+    from sos_batch import BatchGames, BLUE_WINS, RED_WINS, NO_WINNER
+
+H_BLUE = HumanPlayer("Blue", "S")
+H_RED = HumanPlayer("Red", "S")
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestBatchGames(unittest.TestCase):
+    # Replays every batch game through the engine and compares the outcome
+    def check_against_engine(self, mode, game_cls):
+        batch = BatchGames(40, 5, mode, seed=11)
+        moves = [[] for _ in range(40)]
+        while not batch.game_over.all():
+            live = batch.active()
+            rows, cols, pieces = batch.random_moves()
+            for i in np.flatnonzero(live):
+                moves[i].append((int(rows[i]), int(cols[i]), 'S' if pieces[i] == 1 else 'O'))
+            batch.step(rows, cols, pieces)
+
+        for i in range(40):
+            game = game_cls(5, H_BLUE, H_RED)
+            for r, c, piece in moves[i]:
+                self.assertTrue(game.make_move(r, c, piece)[1])
+            self.assertTrue(game.game_over)
+            expected = {"Blue": BLUE_WINS, "Red": RED_WINS, None: NO_WINNER}[game.winner]
+            self.assertEqual(batch.winner[i], expected)
+            self.assertEqual(batch.blue_turn[i], game.current_turn_is_blue)
+            if mode == "general":
+                self.assertEqual(batch.blue_score[i], game.blue_score)
+                self.assertEqual(batch.red_score[i], game.red_score)
+
+    def test_simple_rules_match_engine(self):
+        self.check_against_engine("simple", SimpleGame)
+
+    def test_general_rules_match_engine(self):
+        self.check_against_engine("general", GeneralGame)
+
+    def test_play_random_finishes_everything(self):
+        batch = BatchGames(100, 4, "general", seed=2)
+        moves = batch.play_random()
+        self.assertEqual(moves, 100 * 16)
+        results = batch.results()
+        self.assertEqual(results["unfinished"], 0)
+        self.assertEqual(results["blue_wins"] + results["red_wins"] + results["draws"], 100)
+
+    # Random moves must still find every empty cell after a game played somewhere else
+    def test_random_moves_after_custom_step(self):
+        batch = BatchGames(3, 3, "general", seed=5)
+        rows, cols, pieces = batch.random_moves()
+        other = [(r * 3 + c + 1) % 9 for r, c in zip(rows, cols)]
+        batch.step([i // 3 for i in other], [i % 3 for i in other], [1, 1, 1])
+        self.assertEqual(batch.play_random(), 3 * 8)
+        self.assertTrue(batch.game_over.all())
+
+    def test_occupied_cell_rejected(self):
+        batch = BatchGames(2, 3, "simple", seed=0)
+        batch.step([0, 0], [0, 0], [1, 1])
+        with self.assertRaises(ValueError):
+            batch.step([0, 1], [0, 1], [1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+import SosGame
+from sos_bench import OPERATIONS, compare, run_benchmarks
+
+
+class BenchTests(unittest.TestCase):
+    def test_runs_every_operation_without_the_network(self):
+        SosGame.CLAUDE_API_KEY, saved = "sk-ant-not-a-real-key", SosGame.CLAUDE_API_KEY
+        try:
+            result = run_benchmarks(sizes=(3, 7), repeats=1, min_time=0.0)
+        finally:
+            SosGame.CLAUDE_API_KEY = saved
+        self.assertEqual(set(result["results"]), set(OPERATIONS))
+        for sizes in result["results"].values():
+            self.assertEqual(set(sizes), {"3", "7"})
+            self.assertTrue(all(ns > 0 for ns in sizes.values()))
+
+    def test_compare_flags_only_past_the_threshold(self):
+        baseline = {"results": {"make_move": {"3": 100.0, "50": 100.0}, "is_board_full": {"3": 50.0}}}
+        current = {"results": {"make_move": {"3": 109.0, "50": 125.0, "500": 1e9}, "is_board_full": {"3": 10.0}}}
+        self.assertEqual(compare(current, baseline, threshold=10), [("make_move", 50, 100.0, 125.0, 25.0)])
+        self.assertEqual(compare(current, baseline, threshold=30), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import random
+import tempfile
+import unittest
+from SosGame import SimpleGame, GeneralGame, HumanPlayer, ComputerPlayer
+from sos_book import OpeningBook, book_key, solve_positions, write_book
+from sos_search import AlphaBetaPlayer
+
+H_BLUE = HumanPlayer("Blue", "S")
+H_RED = HumanPlayer("Red", "S")
+
+
+class TestOpeningBook(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "book.bin")
+        entries = solve_positions(3, "simple")
+        entries.update(solve_positions(3, "general"))
+        write_book(cls.path, entries)
+        cls.book = OpeningBook(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.book.close()
+        cls.tmp.cleanup()
+
+    # Tests that every book move is legal and wins when a win is there
+    def test_book_moves_on_random_positions(self):
+        rng = random.Random(5)
+        for _ in range(50):
+            game = SimpleGame(3, H_BLUE, H_RED)
+            for _ in range(rng.randrange(5)):
+                r, c = game.random_free_cell(rng)
+                game.make_move(r, c, rng.choice('SO'))
+            if game.game_over:
+                continue
+            r, c, piece, value = self.book.lookup(game)
+            self.assertTrue(game.is_free(r, c))
+            if game.has_scoring_move():
+                self.assertEqual(value, 1)
+                soses, _ = game.make_move(r, c, piece)
+                self.assertTrue(soses)
+
+    # Tests that every reachable unfinished position is in the book, not just those on the winning lines
+    def test_every_reachable_position_is_booked(self):
+        for cls in (SimpleGame, GeneralGame):
+            pending, seen = [cls(3, H_BLUE, H_RED)], set()
+            while pending:
+                game = pending.pop()
+                key = book_key(game)[0]
+                if key in seen or game.game_over:
+                    continue
+                seen.add(key)
+                self.assertIsNotNone(self.book.lookup(game), game.board)
+                for r, c in list(game.legal_moves()):
+                    for piece in 'SO':
+                        child = game.copy()
+                        child.make_move(r, c, piece)
+                        pending.append(child)
+
+    # Tests that a rotated position is found and the move is rotated back
+    def test_symmetric_lookup(self):
+        game = GeneralGame(3, H_BLUE, H_RED)
+        game.board = [['S', 'O', ''], ['', '', ''], ['', '', '']]
+        turned = GeneralGame(3, H_BLUE, H_RED)
+        turned.board = [['', '', 'S'], ['', '', 'O'], ['', '', '']]
+        r, c, piece, value = self.book.lookup(game)
+        tr, tc, tpiece, tvalue = self.book.lookup(turned)
+        self.assertEqual(value, tvalue)
+        self.assertEqual(game.move_points(r, c, piece), turned.move_points(tr, tc, tpiece))
+
+    # Tests that sizes and modes don't share entries
+    def test_unknown_positions_miss(self):
+        self.assertIsNone(self.book.lookup(SimpleGame(4, H_BLUE, H_RED)))
+        self.assertIsNotNone(self.book.lookup(SimpleGame(3, H_BLUE, H_RED)))
+
+    # Tests that players answer from the book without searching
+    def test_players_use_book(self):
+        game = GeneralGame(3, H_BLUE, H_RED)
+        game.board = [['S', 'O', ''], ['', '', ''], ['', '', '']]
+        searcher = AlphaBetaPlayer("Blue", "S", time_limit=0.5, book=self.book)
+        move = searcher.get_move(game)
+        self.assertEqual(searcher.nodes, 0)
+        self.assertEqual(game.move_points(*move), 1)
+        computer = ComputerPlayer("Blue", "S", verbose=False, book=self.book)
+        self.assertEqual(computer.get_move(game), move)
+
+
+if __name__ == '__main__':
+    unittest.main()
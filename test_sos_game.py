@@ -1,3 +1,5 @@
+import threading
+import time
 import unittest
 from SosGame import SimpleGame, GeneralGame, HumanPlayer, ComputerPlayer
 
@@ -24,6 +26,17 @@ class TestPlayerHierarchy(unittest.TestCase):
         self.assertIsNotNone(r)
         self.assertIsNotNone(c)
         self.assertIn(piece, ['S', 'O'])
+        self.assertIn((r, c), set(game.legal_moves()))
+
+    # Tests that an abandoned computer move skips its think delay
+    def test_computer_player_cancelled(self):
+        game = SimpleGame(3, C_BLUE_S, H_RED)
+        player = ComputerPlayer("Blue", "S", think_delay=30.0, verbose=False)
+        cancel = threading.Event()
+        cancel.set()
+        start = time.perf_counter()
+        self.assertEqual(player.get_move(game, cancel), (None, None, None))
+        self.assertLess(time.perf_counter() - start, 5.0)
 
 class TestSimpleGame(unittest.TestCase):
 
@@ -87,6 +100,29 @@ class TestSimpleGame(unittest.TestCase):
         self.assertIsNone(self.game.winner)
         self.assertEqual(len(self.game.history), 9)
 
+    # Checks that the free-cell index shrinks with every move
+    def test_legal_moves_tracking(self):
+        self.assertEqual(self.game.free_count(), 9)
+        self.game.make_move(1, 1, 'S')
+        self.game.make_move(0, 2, 'O')
+        moves = set(self.game.legal_moves())
+        self.assertEqual(len(moves), 7)
+        self.assertNotIn((1, 1), moves)
+        self.assertNotIn((0, 2), moves)
+        self.assertFalse(self.game.is_free(1, 1))
+        self.assertTrue(self.game.is_free(0, 0))
+        self.assertFalse(self.game.is_free(3, 0))
+
+    # Checks that assigning a board rebuilds the free cells
+    def test_board_assignment_rebuilds_free_cells(self):
+        self.game.board = [
+            ['S', 'O', ''],
+            ['', '', ''],
+            ['', 'S', '']
+        ]
+        self.assertEqual(self.game.free_count(), 6)
+        self.assertNotIn((0, 0), set(self.game.legal_moves()))
+
 class TestGeneralGame(unittest.TestCase):
     # Sets up a general game before each test
     def setUp(self):
@@ -107,6 +143,91 @@ class TestGeneralGame(unittest.TestCase):
         self.assertEqual(len(self.game.history), 3)
         self.assertEqual(self.game.history[-1], (0, 2, 'S'))
 
+    # Plays a whole 100x100 game off the free-cell index
+    def test_large_board_full_game(self):
+        game = GeneralGame(100, H_BLUE, H_RED)
+        while not game.game_over:
+            r, c = game.random_free_cell()
+            game.make_move(r, c, 'S' if (r + c) % 2 else 'O')
+        self.assertTrue(game.is_board_full())
+        self.assertEqual(len(game.history), 100 * 100)
+        self.assertEqual(list(game.legal_moves()), [])
+
+class TestCompactBoard(unittest.TestCase):
+    # Plays the same moves on both backends and compares the views
+    def test_compact_matches_list_backend(self):
+        moves = [(0, 0, 'S'), (1, 1, 'O'), (2, 2, 'S'), (0, 2, 'O'), (2, 0, 'S')]
+        plain = GeneralGame(3, H_BLUE, H_RED)
+        compact = GeneralGame(3, H_BLUE, H_RED, compact=True)
+        for r, c, p in moves:
+            self.assertEqual(plain.make_move(r, c, p), compact.make_move(r, c, p))
+        self.assertEqual([list(row) for row in compact.board], plain.board)
+        self.assertEqual(compact.history, plain.history)
+        self.assertEqual(compact.history[-1], (2, 0, 'S'))
+        self.assertEqual(compact.blue_score, plain.blue_score)
+
+    # Checks that the board can't be written through the view in either mode
+    def test_compact_board_is_read_only(self):
+        for compact in (True, False):
+            game = SimpleGame(3, H_BLUE, H_RED, compact=compact)
+            with self.assertRaises(TypeError):
+                game.board[0][0] = 'S'
+
+    # Checks that cell() reads the same pieces as board[r][c]
+    def test_cell_matches_board(self):
+        game = GeneralGame(3, H_BLUE, H_RED)
+        game.make_move(0, 1, 'S')
+        game.make_move(2, 2, 'O')
+        self.assertEqual([[game.cell(r, c) for c in range(3)] for r in range(3)], game.board)
+
+    # Checks that copies don't share state with the original
+    def test_copy_is_independent(self):
+        game = GeneralGame(4, H_BLUE, H_RED, compact=True)
+        game.make_move(0, 0, 'S')
+        clone = game.copy()
+        clone.make_move(0, 1, 'O')
+        self.assertEqual(game.board[0][1], '')
+        self.assertEqual(clone.board[0][1], 'O')
+        self.assertEqual(len(game.history), 1)
+        self.assertEqual(game.free_count(), 15)
+        self.assertEqual(clone.free_count(), 14)
+
+    # Checks that game objects don't carry a per-instance __dict__
+    def test_slots(self):
+        game = GeneralGame(3, H_BLUE, H_RED)
+        self.assertFalse(hasattr(game, '__dict__'))
+        self.assertFalse(hasattr(C_BLUE_S, '__dict__'))
+
+class TestThreatMap(unittest.TestCase):
+    # Checks the live map against a full rescan after every move of a random game
+    def test_threat_map_matches_rescan(self):
+        import random
+        rng = random.Random(7)
+        tracked = GeneralGame(6, H_BLUE, H_RED, track_threats=True)
+        plain = GeneralGame(6, H_BLUE, H_RED)
+        while not tracked.game_over:
+            r, c = tracked.random_free_cell(rng)
+            piece = rng.choice('SO')
+            tracked.make_move(r, c, piece)
+            plain.make_move(r, c, piece)
+            self.assertEqual(sorted(tracked.scoring_moves()), sorted(plain.scoring_moves()))
+            self.assertEqual(tracked.cells_to_avoid('S'), plain.cells_to_avoid('S'))
+            self.assertEqual(tracked.cells_to_avoid('O'), plain.cells_to_avoid('O'))
+            self.assertEqual(tracked.has_scoring_move(), plain.has_scoring_move())
+
+    # Checks the point lookups on a hand-made board
+    def test_move_points(self):
+        game = GeneralGame(3, H_BLUE, H_RED, track_threats=True)
+        game.board = [
+            ['S', '', 'S'],
+            ['', '', ''],
+            ['S', '', 'S']
+        ]
+        self.assertEqual(game.move_points(1, 1, 'O'), 2)
+        self.assertEqual(game.move_points(0, 1, 'O'), 1)
+        self.assertEqual(game.move_points(1, 1, 'S'), 0)
+        self.assertTrue(game.has_scoring_move())
+
 class TestComputerLogic(unittest.TestCase):
     # Tests if the computer finds a winning move with S
     def test_computer_simple_game_winning_move_S(self):
@@ -167,5 +288,34 @@ class TestComputerLogic(unittest.TestCase):
         soses, move_made = game.make_move(r, c, piece)
         self.assertEqual(game.blue_score, 1)
 
+    # Tests that the heuristic takes the point when one is there
+    def test_heuristic_takes_scoring_move(self):
+        player = ComputerPlayer("Blue", "O", strategy="heuristic")
+        game = GeneralGame(4, player, H_RED)
+        game.board = [
+            ['S', '', 'S', ''],
+            ['', '', '', ''],
+            ['', '', '', ''],
+            ['', '', '', '']
+        ]
+        self.assertEqual(player.get_move(game), (0, 1, 'O'))
+
+    # Tests that the heuristic never hands the opponent an SOS when it can avoid it
+    def test_heuristic_avoids_setups(self):
+        player = ComputerPlayer("Blue", "S", strategy="heuristic")
+        for _ in range(20):
+            game = SimpleGame(4, player, H_RED)
+            game.board = [
+                ['S', '', '', 'S'],
+                ['', '', '', ''],
+                ['', '', '', ''],
+                ['', '', '', '']
+            ]
+            r, c, piece = player.get_move(game)
+            game.make_move(r, c, piece)
+            threats = [(fr, fc, p) for fr, fc in game.legal_moves() for p in 'SO' if game._check_for_sos(fr, fc, p)]
+            self.assertEqual(threats, [])
+            self.assertNotIn((r, c), [(0, 1), (0, 2)])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,216 @@
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from SosGame import SimpleGame, HumanPlayer
+from sos_llm import ClaudeMoveClient, LLMMoveCache, MoveProviderError
+
+
+# Local stand-in for the Messages API. `script` is a list of (status, delay) to
+# answer with, one per request; once it runs out every request gets a 200.
+class FakeAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+        server.requests.append((self.client_address, body, dict(self.headers)))
+        status, delay = server.script.pop(0) if server.script else (200, 0)
+        time.sleep(delay)
+        reply = json.dumps({"content": [{"type": "text", "text": '{"row": 0, "col": 2, "piece": "S"}'}]}).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(reply)))
+        if status == 429:
+            self.send_header("retry-after", "0")
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+class QuietServer(ThreadingHTTPServer):
+    # clients that time out hang up mid-answer; that's expected here
+    def handle_error(self, request, client_address):
+        pass
+
+
+class TestClaudeMoveClient(unittest.TestCase):
+    def setUp(self):
+        self.server = QuietServer(("127.0.0.1", 0), FakeAPIHandler)
+        self.server.requests = []
+        self.server.script = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def make_client(self, **kwargs):
+        kwargs.setdefault("backoff", 0.01)
+        return ClaudeMoveClient("test-key", "test-model", "system prompt", base_url=self.base_url, **kwargs)
+
+    # Tests that consecutive moves reuse one kept-alive connection
+    def test_connection_reuse(self):
+        client = self.make_client()
+        for _ in range(3):
+            self.assertIn('"row": 0', client.complete("board"))
+        client.close()
+        self.assertEqual(client.connections_opened, 1)
+        self.assertEqual(len({address for address, _, _ in self.server.requests}), 1)
+        _, body, headers = self.server.requests[0]
+        self.assertEqual(body["system"], "system prompt")
+        self.assertEqual(headers["x-api-key"], "test-key")
+
+    # Tests that 429 and 5xx answers are retried
+    def test_retries_then_succeeds(self):
+        self.server.script = [(429, 0), (503, 0)]
+        client = self.make_client()
+        client.complete("board")
+        client.close()
+        self.assertEqual(client.retries, 2)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(client.stats()["errors"], 0)
+
+    # Tests that retries are bounded
+    def test_gives_up_after_max_retries(self):
+        self.server.script = [(500, 0)] * 5
+        client = self.make_client(max_retries=2)
+        with self.assertRaises(MoveProviderError):
+            client.complete("board")
+        client.close()
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(client.stats()["errors"], 1)
+
+    # Tests that one caller's backoff doesn't hold up another thread sharing the client
+    def test_backoff_does_not_block_other_callers(self):
+        self.server.script = [(500, 0)]
+        client = self.make_client(backoff=2.0, max_backoff=2.0)
+        random.seed(0)  # first backoff is about 1.7s
+        waiting = threading.Thread(target=client.complete, args=("board",))
+        waiting.start()
+        time.sleep(0.2)
+        start = time.perf_counter()
+        client.complete("other board")
+        self.assertLess(time.perf_counter() - start, 1.0)
+        waiting.join()
+        client.close()
+        self.assertEqual(client.stats()["calls"], 2)
+
+    # Tests that a cancelled call stops retrying
+    def test_cancel_stops_retries(self):
+        self.server.script = [(500, 0)] * 5
+        client = self.make_client(max_retries=4, backoff=30.0, max_backoff=30.0)
+        random.seed(0)  # first backoff is well past the cancel
+        cancel = threading.Event()
+        threading.Timer(0.1, cancel.set).start()
+        start = time.perf_counter()
+        with self.assertRaises(MoveProviderError):
+            client.complete("board", cancel)
+        client.close()
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertEqual(len(self.server.requests), 1)
+
+    # Tests that a slow answer trips the read timeout
+    def test_read_timeout(self):
+        self.server.script = [(200, 0.5)]
+        client = self.make_client(read_timeout=0.1, max_retries=0)
+        with self.assertRaises(MoveProviderError):
+            client.complete("board")
+        client.close()
+
+    def test_latency_stats(self):
+        client = self.make_client()
+        client.complete("board")
+        client.complete("board")
+        client.close()
+        stats = client.stats()
+        self.assertEqual(stats["calls"], 2)
+        self.assertGreater(stats["mean_s"], 0)
+        self.assertLessEqual(stats["p50_s"], stats["max_s"])
+
+
+def board_cells(rows):
+    game = SimpleGame(len(rows), HumanPlayer("Blue", "S"), HumanPlayer("Red", "S"))
+    game.board = rows
+    return game._cells
+
+
+class TestLLMMoveCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "moves.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # Tests that a rotated position hits and the move comes back rotated too
+    def test_symmetric_hit(self):
+        cache = LLMMoveCache(self.path)
+        board = [
+            ['S', 'O', ''],
+            ['', '', ''],
+            ['', '', '']
+        ]
+        cache.put(board_cells(board), 3, "Blue", "SimpleGame", (0, 2, 'S'))
+        # the same position turned a quarter clockwise
+        rotated = [
+            ['', '', 'S'],
+            ['', '', 'O'],
+            ['', '', '']
+        ]
+        self.assertEqual(cache.get(board_cells(rotated), 3, "Blue", "SimpleGame"), (2, 2, 'S'))
+        self.assertIsNone(cache.get(board_cells(rotated), 3, "Red", "SimpleGame"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.close()
+
+    # Tests that the least recently used entry goes first
+    def test_lru_eviction(self):
+        cache = LLMMoveCache(self.path, max_entries=2)
+        boards = [[['S' if i == j else '' for j in range(9)][k * 3:k * 3 + 3] for k in range(3)] for i in (0, 1, 4)]
+        cache.put(board_cells(boards[0]), 3, "Blue", "SimpleGame", (2, 2, 'O'))
+        cache.put(board_cells(boards[1]), 3, "Blue", "SimpleGame", (2, 2, 'O'))
+        cache.get(board_cells(boards[0]), 3, "Blue", "SimpleGame")
+        cache.put(board_cells(boards[2]), 3, "Blue", "SimpleGame", (0, 0, 'O'))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get(board_cells(boards[0]), 3, "Blue", "SimpleGame"))
+        self.assertIsNone(cache.get(board_cells(boards[1]), 3, "Blue", "SimpleGame"))
+        cache.close()
+
+    # Tests that the running entry count survives replacing entries and reopening the file
+    def test_entry_count_across_replace_and_reopen(self):
+        boards = [[['S' if i == j else '' for j in range(9)][k * 3:k * 3 + 3] for k in range(3)] for i in (0, 1, 4)]
+        cache = LLMMoveCache(self.path, max_entries=2)
+        cache.put(board_cells(boards[0]), 3, "Blue", "SimpleGame", (2, 2, 'O'))
+        cache.put(board_cells(boards[0]), 3, "Blue", "SimpleGame", (2, 1, 'S'))
+        cache.put(board_cells(boards[1]), 3, "Blue", "SimpleGame", (2, 2, 'O'))
+        self.assertEqual(len(cache), 2)
+        cache.close()
+        cache = LLMMoveCache(self.path, max_entries=2)
+        cache.put(board_cells(boards[2]), 3, "Blue", "SimpleGame", (0, 0, 'O'))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(board_cells(boards[0]), 3, "Blue", "SimpleGame"))
+        cache.close()
+
+    # Tests that a read-only cache answers but never writes
+    def test_read_only(self):
+        writer = LLMMoveCache(self.path)
+        cells = board_cells([['S', '', ''], ['', '', ''], ['', '', '']])
+        writer.put(cells, 3, "Blue", "SimpleGame", (0, 1, 'O'))
+        writer.close()
+        reader = LLMMoveCache(self.path, read_only=True)
+        self.assertEqual(reader.get(cells, 3, "Blue", "SimpleGame"), (0, 1, 'O'))
+        reader.put(board_cells([['', '', ''], ['', 'O', ''], ['', '', '']]), 3, "Blue", "SimpleGame", (0, 0, 'S'))
+        self.assertEqual(len(reader), 1)
+        reader.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
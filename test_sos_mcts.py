@@ -0,0 +1,66 @@
+import threading
+import unittest
+from SosGame import SimpleGame, GeneralGame, HumanPlayer
+from sos_mcts import MCTSPlayer, blue_result, search_tree
+
+H_BLUE = HumanPlayer("Blue", "S")
+H_RED = HumanPlayer("Red", "S")
+
+
+class TestMCTS(unittest.TestCase):
+    # Tests that enough playouts find the immediate win
+    def test_finds_winning_move(self):
+        game = SimpleGame(3, H_BLUE, H_RED)
+        game.board = [
+            ['S', 'O', ''],
+            ['', '', ''],
+            ['', '', '']
+        ]
+        player = MCTSPlayer("Blue", "S", playouts=1500, seed=4)
+        self.assertEqual(player.get_move(game), (0, 2, 'S'))
+        self.assertEqual(player.last_playouts, 1500)
+
+    # Tests that playouts are undone and leave the game as it was
+    def test_search_leaves_game_untouched(self):
+        game = GeneralGame(4, H_BLUE, H_RED)
+        game.make_move(1, 1, 'S')
+        stats, done = search_tree(game, playouts=200, seed=1)
+        self.assertEqual(done, 200)
+        self.assertEqual(sum(visits for visits, _ in stats.values()), 200)
+        self.assertEqual(game.free_count(), 15)
+        self.assertEqual(len(game.history), 1)
+
+    # Tests that worker trees are merged into one set of root statistics
+    def test_root_parallel(self):
+        game = GeneralGame(4, H_BLUE, H_RED)
+        with MCTSPlayer("Blue", "S", playouts=200, workers=2, seed=2) as player:
+            r, c, piece = player.get_move(game)
+            pool = player._pool
+        self.assertIsNone(player._pool)
+        self.assertRaises(RuntimeError, pool.submit, int)
+        self.assertTrue(game.is_free(r, c))
+        self.assertEqual(player.last_playouts, 200)
+
+    # Tests that a set cancel event stops the search before its time is up
+    def test_cancel_stops_search(self):
+        cancel = threading.Event()
+        cancel.set()
+        stats, done = search_tree(GeneralGame(4, H_BLUE, H_RED), time_limit=30.0, seed=1, cancel=cancel)
+        self.assertEqual((stats, done), ({}, 0))
+
+    # Tests that a search with neither budget is refused instead of running forever
+    def test_needs_a_budget(self):
+        self.assertRaises(ValueError, MCTSPlayer, "Blue", "S", playouts=None, time_limit=None)
+        self.assertRaises(ValueError, search_tree, GeneralGame(3, H_BLUE, H_RED))
+
+    def test_blue_result(self):
+        game = GeneralGame(3, H_BLUE, H_RED)
+        self.assertEqual(blue_result(game), 0.5)
+        game.make_move(0, 0, 'S')
+        game.make_move(0, 1, 'O')
+        game.make_move(0, 2, 'S')
+        self.assertEqual(blue_result(game), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import random
+import unittest
+
+import sos_metrics
+from SosGame import GeneralGame, SimpleGame, ComputerPlayer
+from sos_search import AlphaBetaPlayer
+from sos_testing import play_out, random_game
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self):
+        self.metrics = sos_metrics.Metrics()
+        self.originals = (SimpleGame.make_move, GeneralGame.make_move, ComputerPlayer.get_move)
+
+    def tearDown(self):
+        sos_metrics.disable()
+        self.assertEqual((SimpleGame.make_move, GeneralGame.make_move, ComputerPlayer.get_move), self.originals)
+
+    def test_counts_calls_by_game_and_player_type(self):
+        sos_metrics.enable(self.metrics)
+        random.seed(4)
+        game = GeneralGame(4, ComputerPlayer("Blue", "S", strategy="heuristic", verbose=False),
+                           AlphaBetaPlayer("Red", "S", time_limit=0.01, max_depth=1))
+        play_out(game)
+        data = self.metrics.to_dict()
+        # the search plays moves of its own on copies, so there are more than the 16 real ones
+        self.assertGreater(data["make_move"]["general"]["count"], 16)
+        gets = data["get_move"]
+        self.assertEqual(set(gets), {"heuristic", "alphabeta"})
+        self.assertEqual(gets["heuristic"]["count"] + gets["alphabeta"]["count"], 16)
+        self.assertEqual(gets["heuristic"]["buckets"]["+Inf"], gets["heuristic"]["count"])
+        self.assertIsNotNone(self.metrics.mean("get_move", "heuristic"))
+        # but only the real ones count towards the game itself
+        self.assertEqual(data["games"][str(game.game_id)]["make_move"]["general"]["count"], 16)
+
+    def test_same_type_players_are_kept_apart_per_game(self):
+        sos_metrics.enable(self.metrics)
+        first = random_game(SimpleGame, 3, 5)
+        second = random_game(SimpleGame, 3, 6)
+        games = self.metrics.to_dict()["games"]
+        self.assertNotEqual(first.game_id, second.game_id)
+        for game in (first, second):
+            gets = games[str(game.game_id)]["get_move"]
+            self.assertEqual(set(gets), {"Blue", "Red"})
+            self.assertEqual(gets["Blue"]["count"] + gets["Red"]["count"], len(game.history))
+            self.assertIsNotNone(self.metrics.mean("get_move", "Blue", game.game_id))
+        self.assertEqual(self.metrics.to_dict()["get_move"]["random"]["count"],
+                         len(first.history) + len(second.history))
+        text = self.metrics.to_prometheus()
+        self.assertIn(f'sos_game_call_seconds_count{{game="{first.game_id}",op="get_move",label="Blue"}}', text)
+        self.assertNotIn('sos_call_seconds_count{game=', text)
+
+    def test_disabled_records_nothing(self):
+        sos_metrics.enable(self.metrics)
+        sos_metrics.disable()
+        self.assertFalse(sos_metrics.enabled())
+        random_game(SimpleGame, 3, 0)
+        self.assertEqual(self.metrics.to_dict(), {})
+
+    def test_prometheus_exposition(self):
+        self.metrics.observe("make_move", "simple", 2e-6)
+        self.metrics.observe("make_move", "simple", 0.2)
+        text = self.metrics.to_prometheus()
+        self.assertIn("# TYPE sos_call_seconds histogram", text)
+        self.assertIn('sos_call_seconds_bucket{op="make_move",label="simple",le="5e-06"} 1', text)
+        self.assertIn('sos_call_seconds_bucket{op="make_move",label="simple",le="+Inf"} 2', text)
+        self.assertIn('sos_call_seconds_count{op="make_move",label="simple"} 2', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+from SosGame import GeneralGame
+from sos_records import GameRecord, GameRecordReader, GameRecordWriter, HEADER, HEADERS, MAGIC, pack_moves
+from sos_testing import random_game
+from sos_tournament import run_tournament
+
+
+class GameRecordTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "games.sosrec")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_trip_and_random_access(self):
+        games = [random_game(GeneralGame, 4, seed) for seed in range(5)]
+        with GameRecordWriter(self.path) as writer:
+            for game in games:
+                writer.append(GameRecord.from_game(game, "random", "heuristic"))
+
+        with GameRecordReader(self.path) as reader:
+            self.assertEqual(len(reader), 5)
+            for game, record in zip(games, reader):
+                self.assertEqual(record.moves, list(game.history))
+                self.assertEqual((record.blue_score, record.red_score), (game.blue_score, game.red_score))
+                self.assertEqual(record.winner, game.winner)
+            last = reader[-1]
+            self.assertEqual((last.size, last.mode, last.blue_type, last.red_type), (4, "general", "random", "heuristic"))
+            self.assertEqual(last.moves, list(games[-1].history))
+
+        # fixed-width moves: header plus four bytes per move
+        self.assertEqual(os.path.getsize(self.path), sum(HEADER.size + 4 * len(g.history) for g in games))
+
+    def test_scores_beyond_sixteen_bits(self):
+        # a full 400x400 general game can score far more than 65535 SOS
+        record = GameRecord(400, "general", "alphabeta", "mcts", "Red", 70000, 90000, [(0, 0, 'S'), (399, 399, 'O')])
+        with GameRecordWriter(self.path) as writer:
+            writer.append(record)
+        with GameRecordReader(self.path) as reader:
+            loaded = reader[0]
+        self.assertEqual((loaded.blue_score, loaded.red_score, loaded.winner), (70000, 90000, "Red"))
+        self.assertEqual(loaded.moves, record.moves)
+
+    def test_reads_version_one_games(self):
+        moves = [(0, 0, 'S'), (1, 1, 'O')]
+        old = HEADERS[1].pack(MAGIC, 1, 3, 1, 2, 3, 1, 1, 0, len(moves)) + pack_moves(moves, 3)
+        with open(self.path, "wb") as f:
+            f.write(old)
+        with GameRecordWriter(self.path) as writer:
+            writer.append(GameRecord(3, "simple", "human", "mcts", None, 0, 0, moves))
+        with GameRecordReader(self.path) as reader:
+            first, second = list(reader)
+        self.assertEqual((first.mode, first.blue_type, first.red_type, first.winner), ("general", "random", "heuristic", "Blue"))
+        self.assertEqual((first.blue_score, first.moves), (1, moves))
+        self.assertEqual((second.red_type, second.moves), ("mcts", moves))
+
+    # A crash part-way through an append leaves a cut-off game at the end of the file
+    def test_truncated_trailing_game_is_dropped(self):
+        games = [GameRecord.from_game(random_game(GeneralGame, 4, seed), "random", "random") for seed in range(3)]
+        with GameRecordWriter(self.path) as writer:
+            for record in games[:2]:
+                writer.append(record)
+        with open(self.path, "ab") as f:
+            f.write(games[2].to_bytes()[:HEADER.size + 6])
+        with GameRecordReader(self.path) as reader:
+            self.assertEqual([r.moves for r in reader], [g.moves for g in games[:2]])
+        with GameRecordWriter(self.path) as writer:
+            writer.append(games[2])
+        with GameRecordReader(self.path) as reader:
+            self.assertEqual([r.moves for r in reader], [g.moves for g in games])
+
+    def test_appends_across_writers_and_rebuilds_missing_index(self):
+        for seed in range(3):
+            with GameRecordWriter(self.path) as writer:
+                writer.append(GameRecord.from_game(random_game(GeneralGame, 4, seed), "human", "computer"))
+        os.remove(self.path + ".idx")
+        with GameRecordReader(self.path) as reader:
+            self.assertEqual(len(reader), 3)
+            self.assertEqual(reader[2].moves, list(random_game(GeneralGame, 4, 2).history))
+
+    def test_tournament_records_every_game(self):
+        result = run_tournament("random", "heuristic", 4, size=3, mode="general", record_path=self.path)
+        with GameRecordReader(self.path) as reader:
+            records = list(reader)
+        self.assertEqual(len(records), result.games)
+        self.assertEqual(sum(len(r.moves) for r in records), result.moves)
+        self.assertEqual({r.blue_type for r in records}, {"random", "heuristic"})
+
+
+if __name__ == '__main__':
+    unittest.main()
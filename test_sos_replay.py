@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from SosGame import GeneralGame, SimpleGame
+from sos_records import GameRecord
+from sos_replay import Replay
+from sos_testing import random_game
+
+
+def recorded_game(cls, size, seed):
+    return GameRecord.from_game(random_game(cls, size, seed), "random", "random")
+
+
+def board_after(record, k):
+    board = [[''] * record.size for _ in range(record.size)]
+    for r, c, piece in record.moves[:k]:
+        board[r][c] = piece
+    return board
+
+
+class ReplayTests(unittest.TestCase):
+    def test_seek_matches_a_fresh_playthrough(self):
+        record = recorded_game(GeneralGame, 6, 3)
+        replay = Replay(record, checkpoint_every=5)
+        rng = random.Random(1)
+        for k in [len(replay), 0, 7, 6, 23] + [rng.randrange(len(replay) + 1) for _ in range(30)]:
+            replay.seek(k)
+            self.assertEqual(replay.position, k)
+            self.assertEqual([list(row) for row in replay.game.board], board_after(record, k))
+            self.assertEqual(len(replay.game.history), k)
+        replay.seek(len(replay))
+        self.assertEqual((replay.game.blue_score, replay.game.red_score), (record.blue_score, record.red_score))
+        self.assertEqual(replay.game.winner, record.winner)
+
+    def test_seek_reports_changed_cells(self):
+        record = recorded_game(SimpleGame, 5, 2)
+        replay = Replay(record, checkpoint_every=4)
+        self.assertEqual(replay.step_forward(), [(0, *record.moves[0])])
+        end = len(replay)
+        changed = replay.seek(end)
+        self.assertEqual([i for i, *_ in changed], list(range(1, end)))
+        changed = replay.step_back()
+        self.assertEqual(changed, [(end - 1, record.moves[-1][0], record.moves[-1][1], '')])
+        self.assertEqual(replay.step_back(), [(end - 2, record.moves[-2][0], record.moves[-2][1], '')])
+        self.assertFalse(replay.game.game_over)
+        # clamped at both ends
+        replay.seek(0)
+        self.assertEqual(replay.step_back(), [])
+
+    def test_lines_are_kept_per_move(self):
+        record = recorded_game(GeneralGame, 4, 0)
+        replay = Replay(record)
+        total = sum(len(replay.lines(i)[0]) for i in range(len(replay)))
+        self.assertEqual(total, record.blue_score + record.red_score)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import random
+import threading
+import time
+import unittest
+from SosGame import SimpleGame, GeneralGame, HumanPlayer
+from sos_search import AlphaBetaPlayer, TranspositionTable
+
+H_BLUE = HumanPlayer("Blue", "S")
+H_RED = HumanPlayer("Red", "S")
+
+
+# Plain minimax over every move, used as the reference value
+def brute_force(game, simple):
+    best = None
+    for r, c in list(game.legal_moves()):
+        for piece in 'SO':
+            mover = game.current_turn_is_blue
+            soses, _ = game.make_move(r, c, piece)
+            if simple:
+                value = 1 if soses else 0 if game.game_over else -brute_force(game, simple)
+            else:
+                value = len(soses)
+                if not game.game_over:
+                    child = brute_force(game, simple)
+                    value += child if game.current_turn_is_blue == mover else -child
+            game.undo_move()
+            if best is None or value > best:
+                best = value
+    return best
+
+
+def random_position(cls, size, empties, seed):
+    rng = random.Random(seed)
+    game = cls(size, H_BLUE, H_RED)
+    while game.free_count() > empties and not game.game_over:
+        r, c = game.random_free_cell(rng)
+        game.make_move(r, c, rng.choice('SO'))
+    return game
+
+
+class TestAlphaBeta(unittest.TestCase):
+    # Checks the chosen move is worth as much as the best move found by brute force
+    def test_matches_brute_force(self):
+        for cls, simple in ((SimpleGame, True), (GeneralGame, False)):
+            for seed in range(15):
+                game = random_position(cls, 4, 5, seed)
+                if game.game_over:
+                    continue
+                target = brute_force(game, simple)
+                player = AlphaBetaPlayer("Blue", "S", time_limit=5.0)
+                r, c, piece = player.get_move(game)
+                mover = game.current_turn_is_blue
+                soses, ok = game.make_move(r, c, piece)
+                self.assertTrue(ok)
+                if simple:
+                    value = 1 if soses else 0 if game.game_over else -brute_force(game, simple)
+                else:
+                    value = len(soses)
+                    if not game.game_over:
+                        child = brute_force(game, simple)
+                        value += child if game.current_turn_is_blue == mover else -child
+                self.assertEqual(value, target, (cls.__name__, seed))
+
+    # Checks that the search plays and takes back moves without leaving a trace
+    def test_search_leaves_game_untouched(self):
+        game = random_position(GeneralGame, 5, 12, 3)
+        before = ([list(row) for row in game.board], list(game.history), game.blue_score, game.red_score)
+        AlphaBetaPlayer("Blue", "S", time_limit=0.3).get_move(game)
+        after = ([list(row) for row in game.board], list(game.history), game.blue_score, game.red_score)
+        self.assertEqual(before, after)
+
+    # Checks the deadline is kept on a board too big to search out
+    def test_respects_time_limit(self):
+        game = GeneralGame(12, H_BLUE, H_RED)
+        player = AlphaBetaPlayer("Blue", "S", time_limit=0.2)
+        start = time.perf_counter()
+        r, c, piece = player.get_move(game)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertTrue(game.is_free(r, c))
+        self.assertGreaterEqual(player.last_depth, 1)
+
+    # Checks a search that can't finish depth 1 doesn't report the last position's value
+    def test_unfinished_search_has_no_value(self):
+        player = AlphaBetaPlayer("Blue", "S", time_limit=1.0, max_depth=2)
+        player.get_move(random_position(GeneralGame, 4, 5, 1))
+        self.assertIsNotNone(player.last_value)
+        player.time_limit = -1.0
+        player.get_move(GeneralGame(8, H_BLUE, H_RED))
+        self.assertIsNone(player.last_value)
+        self.assertEqual(player.last_depth, 0)
+
+    # Checks that setting the cancel event ends a long search early
+    def test_cancel_stops_search(self):
+        player = AlphaBetaPlayer("Blue", "S", time_limit=30.0)
+        game = GeneralGame(8, H_BLUE, H_RED)
+        cancel = threading.Event()
+        threading.Timer(0.05, cancel.set).start()
+        start = time.perf_counter()
+        r, c, piece = player.get_move(game, cancel)
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertTrue(game.is_free(r, c))
+
+    # Checks entries from a simple-game search aren't read back in a general game
+    def test_table_is_not_shared_between_modes(self):
+        def position(cls):
+            game = cls(4, H_BLUE, H_RED)
+            game.make_move(0, 0, 'S')
+            game.make_move(3, 3, 'S')
+            return game
+
+        reused = AlphaBetaPlayer("Blue", "S", time_limit=30, max_depth=3)
+        reused.get_move(position(SimpleGame))
+        hits = reused.table.hits
+        move = reused.get_move(position(GeneralGame))
+        fresh = AlphaBetaPlayer("Blue", "S", time_limit=30, max_depth=3)
+        self.assertEqual(fresh.get_move(position(GeneralGame)), move)
+        self.assertEqual((reused.nodes, reused.table.hits - hits, reused.last_value),
+                         (fresh.nodes, fresh.table.hits, fresh.last_value))
+
+    # Checks undo puts the turn and score back after an extra-turn SOS
+    def test_undo_after_scoring_move(self):
+        game = GeneralGame(3, H_BLUE, H_RED)
+        game.make_move(0, 0, 'S')
+        game.make_move(0, 1, 'O')
+        key = game.position_hash()
+        game.make_move(0, 2, 'S')
+        self.assertEqual(game.blue_score, 1)
+        game.undo_move()
+        self.assertEqual(game.blue_score, 0)
+        self.assertTrue(game.current_turn_is_blue)
+        self.assertEqual(game.position_hash(), key)
+
+    # Checks the table keeps the deeper result of the current search
+    def test_table_replacement(self):
+        table = TranspositionTable(size_bits=2)
+        table.new_search()
+        table.store(4, 5, 1, 0, None)
+        table.store(8, 2, 7, 0, None)
+        self.assertIsNotNone(table.lookup(4))
+        self.assertIsNone(table.lookup(8))
+        table.new_search()
+        table.store(8, 2, 7, 0, None)
+        self.assertIsNotNone(table.lookup(8))
+
+
+if __name__ == '__main__':
+    unittest.main()
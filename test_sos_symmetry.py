@@ -0,0 +1,68 @@
+import random
+import unittest
+from SosGame import GeneralGame, HumanPlayer
+from sos_symmetry import TRANSFORMS, canonical_board, canonical_key, from_canonical, map_cell, to_canonical
+
+H_BLUE = HumanPlayer("Blue", "S")
+H_RED = HumanPlayer("Red", "S")
+
+
+def random_game(size, moves, seed):
+    rng = random.Random(seed)
+    game = GeneralGame(size, H_BLUE, H_RED)
+    for _ in range(moves):
+        r, c = game.random_free_cell(rng)
+        game.make_move(r, c, rng.choice('SO'))
+    return game
+
+
+def transformed(game, t):
+    n = game.board_size
+    rows = [['' for _ in range(n)] for _ in range(n)]
+    for r in range(n):
+        for c in range(n):
+            tr, tc = map_cell(t, r, c, n)
+            rows[tr][tc] = game.board[r][c]
+    other = GeneralGame(n, H_BLUE, H_RED)
+    other.board = rows
+    return other
+
+
+class TestSymmetry(unittest.TestCase):
+    # Checks every rotation and reflection gets the same key and canonical board
+    def test_key_is_symmetry_invariant(self):
+        for seed in range(10):
+            game = random_game(5, 9, seed)
+            key, _ = canonical_key(game)
+            board, _ = canonical_board(game)
+            for t in TRANSFORMS:
+                other = transformed(game, t)
+                self.assertEqual(canonical_key(other)[0], key)
+                self.assertEqual(canonical_board(other)[0], board)
+
+    # Checks the incrementally kept hashes match a rebuild, through moves and undos
+    def test_incremental_hashes(self):
+        game = GeneralGame(6, H_BLUE, H_RED)
+        game.symmetry_hashes()
+        rng = random.Random(1)
+        for _ in range(20):
+            r, c = game.random_free_cell(rng)
+            game.make_move(r, c, rng.choice('SO'))
+        for _ in range(5):
+            game.undo_move()
+        fresh = GeneralGame(6, H_BLUE, H_RED)
+        fresh.board = [list(row) for row in game.board]
+        self.assertEqual(game.symmetry_hashes(), fresh.symmetry_hashes())
+
+    # Checks a move mapped into the canonical frame lands on the same cell of the canonical board
+    def test_move_mapping(self):
+        game = random_game(5, 6, 4)
+        board, t = canonical_board(game)
+        for r, c in list(game.legal_moves()):
+            cr, cc, piece = to_canonical((r, c, 'S'), t, 5)
+            self.assertEqual(board[cr * 5 + cc], 0)
+            self.assertEqual(from_canonical((cr, cc, piece), t, 5), (r, c, 'S'))
+
+
+if __name__ == '__main__':
+    unittest.main()
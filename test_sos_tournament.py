@@ -0,0 +1,40 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+import sos
+from sos_tournament import run_tournament, play_game
+
+
+class TestTournament(unittest.TestCase):
+    # Tests that the same seed gives the same results
+    def test_seeded_runs_repeat(self):
+        first = run_tournament("heuristic", "random", 20, size=4, mode="general", seed=5)
+        second = run_tournament("heuristic", "random", 20, size=4, mode="general", seed=5)
+        self.assertEqual((first.a_wins, first.b_wins, first.draws, first.a_points, first.b_points),
+                         (second.a_wins, second.b_wins, second.draws, second.a_points, second.b_points))
+        self.assertEqual(first.a_wins + first.b_wins + first.draws, 20)
+
+    # Tests that a full board is played out in the general game
+    def test_general_game_fills_board(self):
+        a_is_blue, winner, blue_score, red_score, moves = play_game((4, "general", "random", "random", True, 1, 0.1, 10))
+        self.assertEqual(moves, 16)
+        self.assertTrue(a_is_blue)
+
+    # Tests that MCTS at its default playout budget is clearly stronger than random
+    def test_default_mcts_beats_random(self):
+        result = run_tournament("mcts", "random", 10, size=4, mode="general", seed=3)
+        self.assertGreaterEqual(result.a_wins, 8)
+
+    # Tests the command line entry point
+    def test_cli(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = sos.main(["tournament", "heuristic", "random", "-n", "10", "-s", "3", "--seed", "1"])
+        self.assertEqual(code, 0)
+        self.assertIn("heuristic wins:", out.getvalue())
+        self.assertIn("games/s", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()